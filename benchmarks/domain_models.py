@@ -0,0 +1,110 @@
+"""
+Construction rate and memory per object of the domain models.
+
+Compares the slotted Message/Inbox (messages not loaded) with equivalent
+plain dataclasses that have a per-instance __dict__ and an eagerly
+allocated empty messages list, i.e. the previous definitions.
+
+    uv run python -m benchmarks.domain_models --objects 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from src.domain.models import Inbox, Message
+
+
+@dataclasses.dataclass
+class DictMessage:
+    inbox_id: uuid.UUID
+    body: str
+    created_at: datetime
+    signature: Optional[str] = None
+    id: Optional[int] = None
+
+
+@dataclasses.dataclass
+class DictInbox:
+    id: uuid.UUID
+    topic: str
+    owner_signature: str
+    expires_at: datetime
+    allow_anonymous: bool
+    message_count: int = 0
+    last_message_at: Optional[datetime] = None
+    version: int = 1
+    messages: List[DictMessage] = dataclasses.field(default_factory=list)
+
+
+INBOX_ID = uuid.uuid4()
+NOW = datetime.now(timezone.utc)
+EXPIRES = NOW + timedelta(days=1)
+BODY = "Feedback: " + "lorem ipsum " * 8
+
+
+def message_factory(cls) -> Callable[[int], object]:
+    return lambda i: cls(
+        inbox_id=INBOX_ID, body=BODY, created_at=NOW, signature=None, id=i
+    )
+
+
+def inbox_factory(cls) -> Callable[[int], object]:
+    return lambda i: cls(
+        id=INBOX_ID,
+        topic="Benchmark topic",
+        owner_signature="owner!abc",
+        expires_at=EXPIRES,
+        allow_anonymous=True,
+        message_count=i,
+    )
+
+
+def objects_per_second(factory: Callable[[int], object], count: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for i in range(count):
+            factory(i)
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    """Memory retained per instance; field values are shared, so this is the
+    cost of the object itself (plus its messages list, where there is one)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the objects is not part of their cost
+    return (after - before - objects.__sizeof__()) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("Message", message_factory(DictMessage), message_factory(Message)),
+        ("Inbox", inbox_factory(DictInbox), inbox_factory(Inbox)),
+    ]
+    for name, before, after in cases:
+        for label, factory in (("dict", before), ("slots", after)):
+            print(
+                f"{name:>8} {label:>5}: "
+                f"{objects_per_second(factory, args.objects):12,.0f} objects/s  "
+                f"{bytes_per_object(factory, args.objects):7.1f} bytes/object"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+End-to-end latency and throughput of every inbox endpoint.
+
+Drives the real FastAPI app through httpx.ASGITransport, like
+tests/conftest.py, against seeded in-memory SQLite (default) or a local
+Postgres. Use a throwaway database: tables are created and filled in place.
+
+    uv run python -m benchmarks.e2e run --output bench.json
+    uv run python -m benchmarks.e2e run --database-url postgresql+asyncpg://... \\
+        --output bench-pg.json
+    uv run python -m benchmarks.e2e compare baseline.json bench.json --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlmodel import SQLModel
+
+from src.application.utils import generate_tripcode
+from src.config import settings
+from src.infrastructure.database.models import InboxDB, MessageDB
+from src.interface.dependencies import get_db_session, get_rate_limiter
+from src.main import app
+
+OWNER = {"username": "bench_owner", "secret": "bench_secret_1"}
+OWNER_HEADERS = {"X-Username": OWNER["username"], "X-Secret": OWNER["secret"]}
+PREFIX = f"/api/{settings.API_VERSION}/inboxes"
+METRICS = ("p50_ms", "p90_ms", "p99_ms")
+
+
+@dataclass
+class Fixture:
+    hot_inbox_id: uuid.UUID
+    empty_inbox_id: uuid.UUID
+
+
+Request = Callable[[httpx.AsyncClient, Fixture, int], Awaitable[httpx.Response]]
+
+
+def _payload(topic: str) -> Dict[str, Any]:
+    return {
+        **OWNER,
+        "topic": topic,
+        "allow_anonymous": True,
+        "expires_at": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat(),
+    }
+
+
+# one entry per route in src/interface/api/inboxes.py (plus the 304 path)
+SCENARIOS: Dict[str, Request] = {
+    "create_inbox": lambda c, f, i: c.post(f"{PREFIX}/", json=_payload(f"Bench {i}")),
+    "get_inbox_details": lambda c, f, i: c.get(f"{PREFIX}/{f.hot_inbox_id}"),
+    "reply_to_inbox": lambda c, f, i: c.post(
+        f"{PREFIX}/{f.hot_inbox_id}/messages", json={"body": f"reply {i}"}
+    ),
+    "reply_to_inbox_batch": lambda c, f, i: c.post(
+        f"{PREFIX}/{f.hot_inbox_id}/messages/batch",
+        json={"messages": [{"body": f"batch {i}.{j}"} for j in range(10)]},
+    ),
+    "change_topic": lambda c, f, i: c.patch(
+        f"{PREFIX}/{f.empty_inbox_id}",
+        json={"topic": f"Renamed {i}"},
+        headers=OWNER_HEADERS,
+    ),
+    "get_inbox_messages": lambda c, f, i: c.get(
+        f"{PREFIX}/{f.hot_inbox_id}/messages",
+        params={"page_size": 100},
+        headers=OWNER_HEADERS,
+    ),
+    "get_inbox_messages_not_modified": lambda c, f, i: c.get(
+        f"{PREFIX}/{f.hot_inbox_id}/messages",
+        params={"page_size": 100},
+        headers={**OWNER_HEADERS, "If-None-Match": "*"},
+    ),
+    "export_inbox_messages": lambda c, f, i: c.get(
+        f"{PREFIX}/{f.hot_inbox_id}/messages/export", headers=OWNER_HEADERS
+    ),
+    "search_inboxes": lambda c, f, i: c.get(
+        f"{PREFIX}/", params={"page_size": 100}, headers=OWNER_HEADERS
+    ),
+}
+
+
+async def seed(session_factory, inboxes: int, messages: int) -> Fixture:
+    owner_signature = await generate_tripcode(OWNER["username"], OWNER["secret"])
+    now = datetime.now(timezone.utc)
+
+    def inbox(topic: str, message_count: int = 0) -> InboxDB:
+        return InboxDB(
+            topic=topic,
+            owner_signature=owner_signature,
+            expires_at=now + timedelta(days=30),
+            allow_anonymous=True,
+            message_count=message_count,
+            last_message_at=now if message_count else None,
+        )
+
+    hot, empty = inbox("Hot inbox", messages), inbox("Empty inbox")
+    async with session_factory() as session:
+        session.add_all([hot, empty, *(inbox(f"Seed {i}") for i in range(inboxes))])
+        await session.flush()
+        session.add_all(
+            MessageDB(
+                inbox_id=hot.id,
+                body=f"Seeded feedback {i}: " + "lorem ipsum " * 8,
+                created_at=now - timedelta(seconds=i),
+                signature="bob!1a2b3c4d5e" if i % 3 else None,
+            )
+            for i in range(messages)
+        )
+        await session.commit()
+    return Fixture(hot_inbox_id=hot.id, empty_inbox_id=empty.id)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": cuts[49] * 1000,
+        "p90_ms": cuts[89] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(latencies) * 1000,
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+def _check(response: httpx.Response) -> None:
+    # 304 is an expected answer for the conditional scenario
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{response.request.method} {response.request.url} -> "
+            f"{response.status_code}: {response.text}"
+        )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    fixture: Fixture,
+    request: Request,
+    requests: int,
+    warmup: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    for i in range(warmup):
+        _check(await request(client, fixture, -1 - i))
+
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            response = await request(client, fixture, i)
+            latencies.append(time.perf_counter() - started)
+            _check(response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def in_process_app(
+    database_url: Optional[str] = None,
+) -> AsyncIterator[tuple[httpx.AsyncClient, sessionmaker]]:
+    """
+    An httpx client wired to the app in this process, with one session per
+    request from a fresh engine (in-memory SQLite unless `database_url`).
+    Also yields the session factory for seeding.
+    """
+    if database_url and make_url(database_url).get_backend_name() == "sqlite":
+        # SQLite allows one writer; queue requests on a single connection
+        # instead of letting them fail on "database is locked"
+        engine = create_async_engine(
+            database_url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=300,
+        )
+    elif database_url:
+        engine = create_async_engine(database_url)
+    else:
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    # every benchmark request comes from one client address; throttling
+    # would measure 429s instead of the endpoints
+    app.dependency_overrides[get_rate_limiter] = lambda: None
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", follow_redirects=True
+        ) as client:
+            yield client, session_factory
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results = {}
+    async with in_process_app(args.database_url) as (client, session_factory):
+        backend = session_factory.kw["bind"].url.get_backend_name()
+        fixture = await seed(session_factory, args.inboxes, args.messages)
+        for name, request in SCENARIOS.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = await run_scenario(
+                client,
+                fixture,
+                request,
+                args.requests,
+                args.warmup,
+                args.concurrency,
+            )
+            print(_format_row(name, results[name]), file=sys.stderr)
+
+    return {
+        "meta": {
+            "backend": backend,
+            "python": platform.python_version(),
+            "seeded_inboxes": args.inboxes,
+            "seeded_messages": args.messages,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def _format_row(name: str, result: Dict[str, float]) -> str:
+    return (
+        f"{name:>32}  p50 {result['p50_ms']:8.2f} ms  p90 {result['p90_ms']:8.2f} ms  "
+        f"p99 {result['p99_ms']:8.2f} ms  {result['throughput_rps']:9.1f} req/s"
+    )
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Returns one line per metric that got slower than baseline by more than
+    `threshold` (0.1 = 10%). Scenarios missing on either side are skipped.
+    """
+    regressions = []
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            continue
+        for metric in METRICS:
+            if after[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name} {metric}: {before[metric]:.2f} -> {after[metric]:.2f} "
+                    f"(+{after[metric] / before[metric] - 1:.0%})"
+                )
+    return regressions
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="benchmark every endpoint")
+    run_parser.add_argument("--database-url", help="e.g. a local Postgres")
+    run_parser.add_argument("--inboxes", type=int, default=500)
+    run_parser.add_argument("--messages", type=int, default=10_000)
+    run_parser.add_argument("--requests", type=int, default=300)
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--concurrency", type=int, default=1)
+    run_parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS))
+    run_parser.add_argument("--output", help="write results as JSON")
+    run_parser.add_argument("--baseline", help="compare against this JSON file")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        current = asyncio.run(run(args))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+        if not args.baseline:
+            return 0
+        baseline = _load(args.baseline)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    regressions = compare(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import math
+from typing import Dict, Iterable, List
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies in microseconds.
+    Every power-of-two range is split into `sub_buckets` linear buckets, so
+    any recorded value is reported within 1/sub_buckets of its true value
+    (128 -> under 1%) in fixed memory, however many samples are recorded.
+    """
+
+    def __init__(self, sub_buckets: int = 128, max_value_us: int = 3_600_000_000):
+        self.sub_buckets = sub_buckets
+        self._shift = int(math.log2(sub_buckets))
+        self.max_value_us = max_value_us
+        self.counts: List[int] = [0] * self._index(max_value_us) + [0]
+        self.total = 0
+        self.min_us = math.inf
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self.sub_buckets:
+            return value_us
+        exponent = value_us.bit_length() - self._shift - 1
+        return (
+            (exponent + 1) * self.sub_buckets
+            + (value_us >> exponent)
+            - self.sub_buckets
+        )
+
+    def _lowest_value(self, index: int) -> int:
+        if index < self.sub_buckets:
+            return index
+        exponent = index // self.sub_buckets - 1
+        return (index % self.sub_buckets + self.sub_buckets) << exponent
+
+    def record(self, seconds: float) -> None:
+        value_us = min(max(int(seconds * 1_000_000), 0), self.max_value_us)
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self.min_us = min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.min_us = min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in milliseconds at `percent` (0-100)."""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._lowest_value(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self, percents: Iterable[float]) -> Dict[str, float]:
+        result = {f"p{p:g}_ms": self.percentile(p) for p in percents}
+        result["max_ms"] = self.max_us / 1000 if self.total else 0.0
+        return result
@@ -0,0 +1,274 @@
+"""
+Replays a weighted mix of API operations at a target rate or concurrency.
+
+Targets a running server (--url) or the app in this process (default,
+in-memory SQLite), and reports HDR-style latency percentiles and error
+rates per operation. The workload is a TOML file, see
+benchmarks/workloads/feedback.toml.
+
+    uv run python -m benchmarks.loadgen benchmarks/workloads/feedback.toml
+    uv run python -m benchmarks.loadgen workload.toml --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import tomllib
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.histogram import LatencyHistogram
+
+PERCENTILES = (50, 75, 90, 99, 99.9)
+OWNER = {"username": "load_owner", "secret": "load_secret_1"}
+OWNER_HEADERS = {"X-Username": OWNER["username"], "X-Secret": OWNER["secret"]}
+
+
+@dataclass
+class Workload:
+    operations: Dict[str, float]
+    duration_seconds: float = 30.0
+    rate: float = 0.0
+    concurrency: int = 10
+    inboxes: int = 10
+    random_seed: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: str) -> "Workload":
+        with open(path, "rb") as f:
+            raw = tomllib.load(f)
+        operations = {op["name"]: float(op["weight"]) for op in raw.pop("operations")}
+        unknown = set(operations) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations {sorted(unknown)}")
+        return cls(operations=operations, **raw)
+
+
+@dataclass
+class Context:
+    prefix: str
+    inbox_ids: List[str]
+    rng: random.Random
+    counter: int = 0
+
+    def pick_inbox(self) -> str:
+        return self.rng.choice(self.inbox_ids)
+
+    def next_id(self) -> int:
+        self.counter += 1
+        return self.counter
+
+
+@dataclass
+class RouteStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+Operation = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+
+def _inbox_payload(topic: str) -> dict:
+    return {
+        **OWNER,
+        "topic": topic,
+        "allow_anonymous": True,
+        "expires_at": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat(),
+    }
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "create_inbox": lambda c, ctx: c.post(
+        f"{ctx.prefix}/", json=_inbox_payload(f"Load inbox {ctx.next_id()}")
+    ),
+    "reply_anonymous": lambda c, ctx: c.post(
+        f"{ctx.prefix}/{ctx.pick_inbox()}/messages",
+        json={"body": f"anonymous feedback {ctx.next_id()}"},
+    ),
+    "reply_signed": lambda c, ctx: c.post(
+        f"{ctx.prefix}/{ctx.pick_inbox()}/messages",
+        json={
+            "body": f"signed feedback {ctx.next_id()}",
+            "username": f"signer_{ctx.rng.randrange(100)}",
+            "secret": "signer_secret",
+        },
+    ),
+    "read_metadata": lambda c, ctx: c.get(f"{ctx.prefix}/{ctx.pick_inbox()}"),
+    "poll_messages": lambda c, ctx: c.get(
+        f"{ctx.prefix}/{ctx.pick_inbox()}/messages",
+        params={"page_size": 20},
+        headers=OWNER_HEADERS,
+    ),
+    "list_inboxes": lambda c, ctx: c.get(
+        f"{ctx.prefix}/", params={"page_size": 20}, headers=OWNER_HEADERS
+    ),
+}
+
+
+@asynccontextmanager
+async def open_client(
+    url: Optional[str], database_url: Optional[str]
+) -> AsyncIterator[httpx.AsyncClient]:
+    if url:
+        async with httpx.AsyncClient(
+            base_url=url, follow_redirects=True, timeout=30
+        ) as client:
+            yield client
+        return
+
+    from benchmarks.e2e import in_process_app
+
+    # an in-memory database on a single pooled connection: concurrent
+    # requests queue for it instead of interleaving their transactions
+    async with in_process_app(database_url or "sqlite+aiosqlite:///:memory:") as (
+        client,
+        _,
+    ):
+        yield client
+
+
+async def _timed(
+    client: httpx.AsyncClient,
+    ctx: Context,
+    name: str,
+    stats: Dict[str, RouteStats],
+    scheduled_at: float,
+) -> None:
+    route = stats[name]
+    try:
+        response = await OPERATIONS[name](client, ctx)
+        status = response.status_code
+    except Exception:
+        # transport failures, or app errors raised through ASGITransport
+        status = 599
+    # measured from when the operation was due, not when it started, so a
+    # stalled server cannot hide its queueing delay (coordinated omission)
+    route.histogram.record(time.perf_counter() - scheduled_at)
+    route.requests += 1
+    route.statuses[status] += 1
+    if status >= 400:
+        route.errors += 1
+
+
+async def run(
+    workload: Workload,
+    url: Optional[str],
+    api_version: str,
+    database_url: Optional[str] = None,
+) -> dict:
+    rng = random.Random(workload.random_seed)
+    names = list(workload.operations)
+    weights = list(workload.operations.values())
+    stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+
+    async with open_client(url, database_url) as client:
+        ctx = Context(prefix=f"/api/{api_version}/inboxes", inbox_ids=[], rng=rng)
+        for i in range(workload.inboxes):
+            response = await client.post(
+                f"{ctx.prefix}/", json=_inbox_payload(f"Seed inbox {i}")
+            )
+            response.raise_for_status()
+            ctx.inbox_ids.append(response.json()["id"])
+
+        started = time.perf_counter()
+        deadline = started + workload.duration_seconds
+        if workload.rate > 0:
+            # open model: operations are due at a fixed cadence; in-flight
+            # work is capped by `concurrency` to bound client memory
+            slots = asyncio.Semaphore(workload.concurrency)
+            tasks = set()
+
+            async def launch(name: str, due: float) -> None:
+                async with slots:
+                    await _timed(client, ctx, name, stats, due)
+
+            due = started
+            while due < deadline:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                name = rng.choices(names, weights)[0]
+                task = asyncio.create_task(launch(name, due))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                due += 1 / workload.rate
+            await asyncio.gather(*tasks)
+        else:
+
+            async def worker() -> None:
+                while time.perf_counter() < deadline:
+                    name = rng.choices(names, weights)[0]
+                    await _timed(client, ctx, name, stats, time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(workload.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "elapsed_seconds": elapsed,
+        "routes": {
+            name: {
+                "requests": route.requests,
+                "throughput_rps": route.requests / elapsed,
+                "error_rate": route.errors / route.requests if route.requests else 0.0,
+                "statuses": dict(sorted(route.statuses.items())),
+                **route.histogram.summary(PERCENTILES),
+            }
+            for name, route in sorted(stats.items())
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    header = "".join(f"{f'p{p:g}':>9}" for p in PERCENTILES)
+    print(
+        f"{'operation':>16} {'requests':>9} {'req/s':>8} {'errors':>7}{header}{'max':>9}"
+    )
+    for name, route in report["routes"].items():
+        cells = "".join(f"{route[f'p{p:g}_ms']:9.2f}" for p in PERCENTILES)
+        print(
+            f"{name:>16} {route['requests']:9d} {route['throughput_rps']:8.1f} "
+            f"{route['error_rate']:7.1%}{cells}{route['max_ms']:9.2f}"
+        )
+    print("latencies in ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("workload", help="TOML workload definition")
+    parser.add_argument("--url", help="base URL of a running server")
+    parser.add_argument(
+        "--database-url",
+        help="database for the in-process app (default: in-memory SQLite)",
+    )
+    parser.add_argument("--api-version", default=None)
+    parser.add_argument("--duration", type=float, help="override duration_seconds")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    workload = Workload.load(args.workload)
+    if args.duration is not None:
+        workload.duration_seconds = args.duration
+    api_version = args.api_version
+    if api_version is None:
+        from src.config import settings
+
+        api_version = settings.API_VERSION
+
+    report = asyncio.run(run(workload, args.url, api_version, args.database_url))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
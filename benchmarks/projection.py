@@ -0,0 +1,120 @@
+"""
+Cost of reading a page of messages: ORM entities versus column projection.
+
+Seeds an in-memory SQLite database, then times the former read path
+(select(MessageDB), identity map, MessageMapper.to_domain per row) against
+SqlAlchemyInboxRepository.get_messages_for_inbox, which selects plain
+columns and maps rows with to_domain_many.
+
+    uv run python -m benchmarks.projection --rows 100
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+
+from src.infrastructure.database.models import InboxDB, MessageDB
+from src.infrastructure.mappers.message_mapper import MessageMapper
+from src.infrastructure.repositories.inbox import SqlAlchemyInboxRepository
+
+
+async def seed(session_factory, rows: int) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    inbox = InboxDB(
+        topic="Benchmark topic",
+        owner_signature="owner!abc",
+        expires_at=now + timedelta(days=1),
+        allow_anonymous=True,
+    )
+    async with session_factory() as session:
+        session.add(inbox)
+        await session.flush()
+        session.add_all(
+            MessageDB(
+                inbox_id=inbox.id,
+                body=f"Feedback number {i}: " + "lorem ipsum " * 8,
+                created_at=now - timedelta(seconds=i),
+                signature="bob!1a2b3c4d5e" if i % 3 else None,
+            )
+            for i in range(rows)
+        )
+        await session.commit()
+    return inbox.id
+
+
+async def read_orm(session: AsyncSession, inbox_id: uuid.UUID, rows: int):
+    mapper = MessageMapper()
+    statement = (
+        select(MessageDB)
+        .where(MessageDB.inbox_id == inbox_id)
+        .order_by(MessageDB.created_at.desc(), MessageDB.id.desc())
+        .limit(rows)
+    )
+    result = await session.execute(statement)
+    return [mapper.to_domain(r) for r in result.scalars().all()]
+
+
+async def read_projection(session: AsyncSession, inbox_id: uuid.UUID, rows: int):
+    repo = SqlAlchemyInboxRepository(session)
+    return await repo.get_messages_for_inbox(inbox_id, limit=rows, offset=0)
+
+
+async def measure(session_factory, read, inbox_id, rows, number, repeat) -> float:
+    """Best per-page time in seconds; a fresh session per page, as per request."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            async with session_factory() as session:
+                page = await read(session, inbox_id, rows)
+        best = min(best, (time.perf_counter() - started) / number)
+    assert len(page) == rows
+    return best
+
+
+async def run(rows: int, number: int, repeat: int) -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    inbox_id = await seed(session_factory, rows)
+
+    results = {}
+    for name, read in (("orm", read_orm), ("projection", read_projection)):
+        results[name] = await measure(
+            session_factory, read, inbox_id, rows, number, repeat
+        )
+    await engine.dispose()
+
+    for name, seconds in results.items():
+        print(
+            f"{name:>10}: {seconds * 1e6:9.1f} us/page  "
+            f"{seconds * 1e6 / rows:7.2f} us/row"
+        )
+    print(f"speedup: {results['orm'] / results['projection']:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.number, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-row cost of rendering a page of messages.
+
+Compares FastAPI's default path for a pydantic return value with a
+response_model (model validation, response_model validation,
+jsonable_encoder, json.dumps) against the one-pass TypeAdapter path in
+src.interface.responses.
+
+    uv run python -m benchmarks.serialization --rows 100
+"""
+
+import argparse
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+
+from src.domain.models import Message
+from src.interface.responses import messages_page_json
+from src.interface.schemas import MessagesResponse
+
+RESPONSE_FIELD = create_model_field(
+    name="Response_get_inbox_messages", type_=MessagesResponse, mode="serialization"
+)
+
+
+def make_page(rows: int) -> list[Message]:
+    inbox_id = uuid.uuid4()
+    start = datetime.now(timezone.utc)
+    return [
+        Message(
+            inbox_id=inbox_id,
+            body=f"Feedback number {i}: " + "lorem ipsum " * 8,
+            created_at=start - timedelta(seconds=i),
+            signature="bob!1a2b3c4d5e" if i % 3 else None,
+            id=10_000 - i,
+        )
+        for i in range(rows)
+    ]
+
+
+def render_default(messages: list[Message]) -> bytes:
+    # what the endpoint used to build, then the steps of
+    # fastapi.routing.serialize_response and JSONResponse.render
+    content = MessagesResponse(messages=messages, next_cursor="cursor")
+    value, errors = RESPONSE_FIELD.validate(content, {}, loc=("response",))
+    assert not errors
+    return JSONResponse(RESPONSE_FIELD.serialize(value, by_alias=True)).body
+
+
+def render_fast(messages: list[Message]) -> bytes:
+    return messages_page_json(messages, "cursor")
+
+
+def measure(render, messages: list[Message], number: int, repeat: int) -> float:
+    """Best per-call time in seconds over `repeat` runs of `number` calls."""
+    return (
+        min(timeit.repeat(lambda: render(messages), number=number, repeat=repeat))
+        / number
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = make_page(args.rows)
+    results = {
+        "default": measure(render_default, messages, args.number, args.repeat),
+        "fast": measure(render_fast, messages, args.number, args.repeat),
+    }
+
+    for name, seconds in results.items():
+        print(
+            f"{name:>8}: {seconds * 1e6:9.1f} us/page  "
+            f"{seconds * 1e6 / args.rows:7.2f} us/row"
+        )
+    print(f"speedup: {results['default'] / results['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
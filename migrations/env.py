@@ -18,7 +18,7 @@ sys.path.append(os.path.join(base_dir, "src"))
 
 from config import settings
 from sqlmodel import SQLModel
-from infrastructure.database.models import InboxDB, MessageDB
+from infrastructure.database.models import IdempotencyKeyDB, InboxDB, MessageDB
 
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
@@ -0,0 +1,34 @@
+"""add id to messages keyset index
+
+Revision ID: 3b9d51c0a7e2
+Revises: 004ef025bf5b
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d51c0a7e2'
+down_revision: Union[str, Sequence[str], None] = '004ef025bf5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # cursor pagination orders by (created_at, id); including id keeps the
+    # whole sort inside the index so deep pages cost the same as page 1
+    op.drop_index('ix_messages_inbox_created', table_name='messages')
+    op.create_index('ix_messages_inbox_created', 'messages', ['inbox_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_inbox_created', table_name='messages')
+    op.create_index('ix_messages_inbox_created', 'messages', ['inbox_id', 'created_at'], unique=False)
@@ -0,0 +1,32 @@
+"""add owner listing indexes
+
+Revision ID: 8f2c6e4d1a93
+Revises: 3b9d51c0a7e2
+Create Date: 2026-10-18 10:03:27.540917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2c6e4d1a93'
+down_revision: Union[str, Sequence[str], None] = '3b9d51c0a7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_inboxes_owner_topic', 'inboxes', ['owner_signature', 'topic', 'id'], unique=False)
+    op.create_index('ix_inboxes_owner_expires', 'inboxes', ['owner_signature', 'expires_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inboxes_owner_expires', table_name='inboxes')
+    op.drop_index('ix_inboxes_owner_topic', table_name='inboxes')
@@ -0,0 +1,44 @@
+"""add inbox message counters
+
+Revision ID: c41e7a9b2d05
+Revises: 8f2c6e4d1a93
+Create Date: 2026-10-18 14:37:02.671350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9b2d05'
+down_revision: Union[str, Sequence[str], None] = '8f2c6e4d1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inboxes', sa.Column('message_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('inboxes', sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True))
+    # backfill from the existing messages; served by ix_messages_inbox_created
+    op.execute(
+        """
+        UPDATE inboxes
+        SET message_count = (
+                SELECT count(*) FROM messages WHERE messages.inbox_id = inboxes.id
+            ),
+            last_message_at = (
+                SELECT max(created_at) FROM messages WHERE messages.inbox_id = inboxes.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('inboxes', 'last_message_at')
+    op.drop_column('inboxes', 'message_count')
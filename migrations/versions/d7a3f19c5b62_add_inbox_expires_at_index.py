@@ -0,0 +1,30 @@
+"""add inbox expires_at index
+
+Revision ID: d7a3f19c5b62
+Revises: c41e7a9b2d05
+Create Date: 2026-10-18 16:12:48.209113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f19c5b62'
+down_revision: Union[str, Sequence[str], None] = 'c41e7a9b2d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_inboxes_expires_at', 'inboxes', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inboxes_expires_at', table_name='inboxes')
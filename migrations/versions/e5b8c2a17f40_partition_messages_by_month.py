@@ -0,0 +1,95 @@
+"""partition messages by month
+
+Revision ID: e5b8c2a17f40
+Revises: d7a3f19c5b62
+Create Date: 2026-10-18 17:26:11.904532
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8c2a17f40'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f19c5b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions created up front past the current month; the app's partition
+# maintenance keeps extending this window afterwards
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partition(month: date) -> None:
+    upper = _add_months(month, 1)
+    op.execute(
+        f"CREATE TABLE messages_p{month.year:04d}{month.month:02d} "
+        f"PARTITION OF messages "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # declarative partitioning is Postgres-only; other backends (SQLite in
+    # tests and local runs) keep the plain table
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # the partition key must be part of every unique constraint, so the
+    # primary key becomes (id, created_at); ids still come from the same
+    # sequence and stay unique in practice
+    op.execute("ALTER TABLE messages RENAME TO messages_unpartitioned")
+    op.execute("ALTER TABLE messages_unpartitioned RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_messages_inbox_created RENAME TO ix_messages_unpartitioned_inbox_created")
+    op.execute(
+        "CREATE TABLE messages "
+        "(LIKE messages_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE messages ADD PRIMARY KEY (id, created_at)")
+    op.create_foreign_key('messages_inbox_id_fkey', 'messages', 'inboxes', ['inbox_id'], ['id'])
+    op.create_index('ix_messages_inbox_created', 'messages', ['inbox_id', 'created_at', 'id'], unique=False)
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM messages_unpartitioned")).scalar()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest is not None else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        _create_partition(month)
+        month = _add_months(month, 1)
+
+    op.execute("INSERT INTO messages SELECT * FROM messages_unpartitioned")
+    op.execute("ALTER SEQUENCE messages_id_seq OWNED BY messages.id")
+    op.execute("DROP TABLE messages_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE messages RENAME TO messages_partitioned")
+    op.execute("ALTER TABLE messages_partitioned RENAME CONSTRAINT messages_pkey TO messages_partitioned_pkey")
+    op.execute("ALTER INDEX ix_messages_inbox_created RENAME TO ix_messages_partitioned_inbox_created")
+    op.execute("CREATE TABLE messages (LIKE messages_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE messages ADD PRIMARY KEY (id)")
+    op.execute("ALTER TABLE messages_partitioned DROP CONSTRAINT messages_inbox_id_fkey")
+    op.create_foreign_key('messages_inbox_id_fkey', 'messages', 'inboxes', ['inbox_id'], ['id'])
+    op.create_index('ix_messages_inbox_created', 'messages', ['inbox_id', 'created_at', 'id'], unique=False)
+    op.execute("INSERT INTO messages SELECT * FROM messages_partitioned")
+    op.execute("ALTER SEQUENCE messages_id_seq OWNED BY messages.id")
+    op.execute("DROP TABLE messages_partitioned")
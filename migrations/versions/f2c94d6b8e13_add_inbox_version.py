@@ -0,0 +1,30 @@
+"""add inbox version
+
+Revision ID: f2c94d6b8e13
+Revises: e5b8c2a17f40
+Create Date: 2026-10-18 18:05:37.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c94d6b8e13'
+down_revision: Union[str, Sequence[str], None] = 'e5b8c2a17f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inboxes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('inboxes', 'version')
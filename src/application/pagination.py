@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+import math
+import uuid
+from datetime import datetime, timezone
+from typing import Any, List
+
+from src.domain.exceptions import InvalidCursorError
+from src.domain.models import Inbox, Message
+from src.domain.repositories import InboxSort
+
+
+def encode_message_cursor(message: Message) -> str:
+    """
+    Builds an opaque cursor pointing just past `message` in newest-first order.
+    """
+    return _encode([message.created_at.isoformat(), message.id])
+
+
+def decode_message_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Turns a cursor produced by `encode_message_cursor` back into its
+    (created_at, id) keyset position.
+    """
+    values = _decode(cursor)
+    try:
+        raw_created_at, raw_id = values
+        created_at = datetime.fromisoformat(raw_created_at)
+        message_id = int(raw_id)
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed pagination cursor.") from e
+
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at, message_id
+
+
+def encode_inbox_cursor(inbox: Inbox, sort: InboxSort) -> str:
+    """
+    Builds an opaque cursor pointing just past `inbox` in the given ordering.
+    The ordering is embedded so a cursor cannot be replayed against another sort.
+    """
+    if sort is InboxSort.EXPIRES_AT:
+        sort_key = inbox.expires_at.isoformat()
+    else:
+        sort_key = inbox.topic
+    return _encode([sort.value, sort_key, str(inbox.id)])
+
+
+def decode_inbox_cursor(
+    cursor: str, sort: InboxSort
+) -> tuple[str | datetime, uuid.UUID]:
+    """
+    Turns a cursor produced by `encode_inbox_cursor` back into its
+    (sort_key, id) keyset position for the given ordering.
+    """
+    values = _decode(cursor)
+    try:
+        raw_sort, sort_key, raw_id = values
+        inbox_id = uuid.UUID(raw_id)
+        if raw_sort != sort.value or not isinstance(sort_key, str):
+            raise ValueError(raw_sort)
+        if sort is InboxSort.EXPIRES_AT:
+            sort_key = datetime.fromisoformat(sort_key)
+            if sort_key.tzinfo is None:
+                sort_key = sort_key.replace(tzinfo=timezone.utc)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed pagination cursor.") from e
+
+    return sort_key, inbox_id
+
+
+def max_inbox_cursor_length(topic_max_length: int) -> int:
+    """
+    Upper bound on the length of any cursor `encode_inbox_cursor` can issue
+    for topics of at most `topic_max_length` characters.
+    """
+    # 6 bytes per topic char covers both 4-byte UTF-8 and JSON \uXXXX escapes
+    # of control characters; 64 bytes is ample for the sort name, uuid and
+    # JSON punctuation
+    max_json_bytes = 6 * topic_max_length + 64
+    return 4 * math.ceil(max_json_bytes / 3)
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursorError("Malformed pagination cursor.") from e
+
+    if not isinstance(values, list):
+        raise InvalidCursorError("Malformed pagination cursor.")
+    return values
@@ -1,16 +1,47 @@
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import AsyncIterator, Callable, Dict, List, Optional
 import logging
-from src.domain.exceptions import NotFoundError
+from src.domain.exceptions import DomainError, InboxExpiredError, NotFoundError
+from src.application.pagination import decode_inbox_cursor, decode_message_cursor
 from src.application.utils import generate_tripcode
 from src.domain.models import Inbox, Message
-from src.domain.repositories import InboxRepository
+from src.domain.repositories import InboxRepository, InboxSort
 from datetime import timezone
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ReplyDraft:
+    body: str
+    username: Optional[str] = None
+    secret: Optional[str] = None
+
+
+@dataclass
+class MessagesPage:
+    """
+    A page of messages with the inbox version it was read at; `messages` is
+    None when the caller already had that version.
+    """
+
+    version: int
+    messages: Optional[List[Message]] = None
+
+
+@dataclass
+class ReplyOutcome:
+    """
+    Result of one draft in a batch: the saved message, or the domain error
+    that rejected it.
+    """
+
+    message: Optional[Message] = None
+    error: Optional[DomainError] = None
+
+
 class InboxService:
     def __init__(self, repository: InboxRepository):
         self.repository = repository
@@ -29,7 +60,7 @@ class InboxService:
             expires_at,
             allow_anonymous,
         )
-        signature = generate_tripcode(username, secret)
+        signature = await generate_tripcode(username, secret)
 
         new_inbox = Inbox(
             id=uuid.uuid4(),
@@ -46,76 +77,219 @@ class InboxService:
     async def reply_to_inbox(
         self, inbox_id: uuid.UUID, body: str, username: str, secret: str
     ) -> None:
-        logger.debug("Fetching inbox id=%s for reply", inbox_id)
-        inbox = await self._get_inbox_or_fail(inbox_id)
-
         if username and secret:
-            signature = generate_tripcode(username, secret)
+            signature = await generate_tripcode(username, secret)
         else:
             signature = None
 
-        logger.debug("Validating new message for inbox id=%s", inbox.id)
-        inbox.validate_new_message(signature)
-
         new_message = Message(
-            inbox_id=inbox.id,
+            inbox_id=inbox_id,
             body=body,
             signature=signature,
             created_at=datetime.now(timezone.utc),
         )
 
-        await self.repository.add_message(new_message)
-        logger.info("Message appended to inbox id=%s", inbox.id)
+        saved = await self.repository.add_message_if_accepted(new_message)
+        if saved is None:
+            logger.debug("Message rejected for inbox id=%s", inbox_id)
+            await self._raise_rejection(inbox_id, signature)
+        logger.info("Message appended to inbox id=%s", inbox_id)
+
+    async def reply_to_inbox_batch(
+        self, inbox_id: uuid.UUID, drafts: List[ReplyDraft]
+    ) -> List[ReplyOutcome]:
+        """
+        Appends several messages to one inbox. The inbox is loaded and checked
+        once, each distinct signer's tripcode is derived once, and every
+        accepted draft is inserted in a single transaction. Drafts the domain
+        rules reject are reported in place without failing the others.
+        """
+        inbox = await self._get_inbox_or_fail(inbox_id)
+        if inbox.is_expired:
+            raise InboxExpiredError("This inbox has expired.")
+
+        signatures: Dict[tuple[str, str], str] = {}
+        outcomes: List[ReplyOutcome] = []
+        accepted: List[Message] = []
+        now = datetime.now(timezone.utc)
+        for draft in drafts:
+            signature = None
+            if draft.username and draft.secret:
+                credentials = (draft.username, draft.secret)
+                if credentials not in signatures:
+                    signatures[credentials] = await generate_tripcode(*credentials)
+                signature = signatures[credentials]
+
+            try:
+                inbox.validate_new_message(signature)
+            except DomainError as exc:
+                outcomes.append(ReplyOutcome(error=exc))
+                continue
+
+            message = Message(
+                inbox_id=inbox_id, body=draft.body, signature=signature, created_at=now
+            )
+            outcomes.append(ReplyOutcome(message=message))
+            accepted.append(message)
+
+        saved = iter(await self.repository.add_messages(accepted))
+        for outcome in outcomes:
+            if outcome.message is not None:
+                outcome.message = next(saved)
+
+        logger.info(
+            "Batch of %d messages appended to inbox id=%s (%d rejected)",
+            len(accepted),
+            inbox_id,
+            len(outcomes) - len(accepted),
+        )
+        return outcomes
 
     async def change_topic(
         self, inbox_id: uuid.UUID, new_topic: str, username: str, secret: str
     ) -> Inbox | None:
-        logger.debug("Fetching inbox id=%s to change topic", inbox_id)
-        inbox = await self._get_inbox_or_fail(inbox_id)
-        self._validate_owner(inbox, username, secret)
+        signature = await generate_tripcode(username, secret)
 
-        inbox_message = await self.repository.get_messages_for_inbox(
-            inbox_id=inbox.id, limit=1, offset=0
+        logger.debug("Updating topic of inbox id=%s", inbox_id)
+        inbox = await self.repository.update_topic_if_unreplied(
+            inbox_id, signature, new_topic
         )
-        has_messages=bool(inbox_message)
-        inbox.change_topic(new_topic, has_messages=has_messages)
+        if inbox is None:
+            # rejected: replay the domain rules to report the right reason
+            inbox = await self._get_inbox_or_fail(inbox_id)
+            inbox.validate_ownership(signature)
+            inbox.change_topic(new_topic, has_messages=True)
 
-        await self.repository.save(inbox)
         logger.info("Inbox topic changed id=%s", inbox.id)
         return inbox
 
     async def get_messages(
-        self, inbox_id: uuid.UUID, username: str, secret: str, page: int, page_size: int
+        self,
+        inbox_id: uuid.UUID,
+        username: str,
+        secret: str,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
     ) -> List[Message]:
         logger.debug(
-            "Fetching messages inbox_id=%s page=%d size=%d",
+            "Fetching messages inbox_id=%s page=%d size=%d cursor=%s",
             inbox_id,
             page,
             page_size,
+            bool(cursor),
         )
         inbox = await self._get_inbox_or_fail(inbox_id)
 
-        self._validate_owner(inbox, username, secret)
+        await self._validate_owner(inbox, username, secret)
 
-        messages = await self.repository.get_messages_for_inbox(
-            inbox_id=inbox_id, limit=page_size, offset=(page - 1) * page_size
-        )
+        messages = await self._fetch_messages(inbox_id, page, page_size, cursor)
         logger.info(
-            "Fetched %d messages inbox_id=%s page=%d size=%d",
+            "Fetched %d messages inbox_id=%s page=%d size=%d cursor=%s",
             len(messages),
             inbox_id,
             page,
             page_size,
+            bool(cursor),
         )
         return messages
 
+    async def export_messages(
+        self, inbox_id: uuid.UUID, username: str, secret: str, batch_size: int
+    ) -> AsyncIterator[Message]:
+        """
+        Checks ownership up front, then hands back a lazy stream of every
+        message in the inbox, oldest first.
+        """
+        inbox = await self._get_inbox_or_fail(inbox_id)
+        await self._validate_owner(inbox, username, secret)
+        logger.info("Exporting messages inbox_id=%s", inbox_id)
+        return self.repository.stream_messages(inbox_id, batch_size)
+
+    async def get_messages_page(
+        self,
+        inbox_id: uuid.UUID,
+        username: str,
+        secret: str,
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        is_current: Optional[Callable[[int], bool]] = None,
+    ) -> MessagesPage:
+        """
+        Conditional read of a page: ownership is checked once, then the
+        version is read from the repository (the inbox may come from a
+        cache) and the page only when `is_current(version)` is false.
+        The version is read first: if a reply lands in between, the page is
+        newer than its version and the next poll simply refetches.
+        """
+        inbox = await self._get_inbox_or_fail(inbox_id)
+        await self._validate_owner(inbox, username, secret)
+
+        version = await self.repository.get_version(inbox_id)
+        if version is None:
+            raise NotFoundError("Inbox not found.")
+        if is_current is not None and is_current(version):
+            return MessagesPage(version=version)
+
+        messages = await self._fetch_messages(inbox_id, page, page_size, cursor)
+        logger.info(
+            "Fetched %d messages inbox_id=%s page=%d size=%d cursor=%s",
+            len(messages),
+            inbox_id,
+            page,
+            page_size,
+            bool(cursor),
+        )
+        return MessagesPage(version=version, messages=messages)
+
+    async def _fetch_messages(
+        self,
+        inbox_id: uuid.UUID,
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+    ) -> List[Message]:
+        if cursor:
+            created_at, message_id = decode_message_cursor(cursor)
+            return await self.repository.get_messages_before(
+                inbox_id=inbox_id,
+                created_at=created_at,
+                message_id=message_id,
+                limit=page_size,
+            )
+        return await self.repository.get_messages_for_inbox(
+            inbox_id=inbox_id, limit=page_size, offset=(page - 1) * page_size
+        )
+
     async def list_user_inboxes(
-        self, username: str, secret: str, page: int, page_size: int
+        self,
+        username: str,
+        secret: str,
+        page: int,
+        page_size: int,
+        sort: InboxSort = InboxSort.TOPIC,
+        cursor: Optional[str] = None,
     ) -> List[Inbox]:
-        owner_signature = generate_tripcode(username, secret)
-        logger.info("Listing inboxes page=%d size=%d", page, page_size)
+        owner_signature = await generate_tripcode(username, secret)
+        logger.info(
+            "Listing inboxes page=%d size=%d sort=%s cursor=%s",
+            page,
+            page_size,
+            sort.value,
+            bool(cursor),
+        )
+        if cursor:
+            sort_key, inbox_id = decode_inbox_cursor(cursor, sort)
+            return await self.repository.get_by_signature_after(
+                owner_signature,
+                sort=sort,
+                sort_key=sort_key,
+                inbox_id=inbox_id,
+                limit=page_size,
+            )
         return await self.repository.get_by_signature(
-            owner_signature, limit=page_size, offset=(page - 1) * page_size
+            owner_signature, limit=page_size, offset=(page - 1) * page_size, sort=sort
         )
 
     async def get_inbox_metadata(self, inbox_id: uuid.UUID) -> Inbox:
@@ -133,7 +307,20 @@ class InboxService:
             raise NotFoundError("Inbox not found.")
         return inbox
 
-    def _validate_owner(self, inbox: Inbox, username: str, secret: str) -> None:
-        signature = generate_tripcode(username, secret)
+    async def _raise_rejection(
+        self, inbox_id: uuid.UUID, signature: Optional[str]
+    ) -> None:
+        """
+        Works out which domain rule made the repository reject a message.
+        Only runs on the (rare) failure path.
+        """
+        inbox = await self._get_inbox_or_fail(inbox_id)
+        inbox.validate_new_message(signature)
+        # the insert checked expiry at the message's created_at, which is
+        # earlier than the check above, so only expiry can get here
+        raise InboxExpiredError("This inbox has expired.")
+
+    async def _validate_owner(self, inbox: Inbox, username: str, secret: str) -> None:
+        signature = await generate_tripcode(username, secret)
         logger.debug("Validating ownership for inbox id=%s", inbox.id)
         inbox.validate_ownership(signature)
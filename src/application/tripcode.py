@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class TripcodeHasher(ABC):
+    """
+    Derives the hashed part of a tripcode from a username and secret.
+    """
+
+    # expensive hashers run in a worker pool and are memoized
+    expensive: bool = False
+
+    def __init__(self, salt: str):
+        self.salt = salt
+
+    @abstractmethod
+    def digest(self, username: str, secret: str) -> str:
+        pass
+
+
+class Sha256TripcodeHasher(TripcodeHasher):
+    """
+    The original scheme: a single salted sha256. Cheap enough to run inline.
+    """
+
+    def digest(self, username: str, secret: str) -> str:
+        raw = f"{username}{secret}{self.salt}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:10]
+
+
+class Pbkdf2TripcodeHasher(TripcodeHasher):
+    expensive = True
+
+    def __init__(self, salt: str, iterations: int):
+        super().__init__(salt)
+        self.iterations = iterations
+
+    def digest(self, username: str, secret: str) -> str:
+        derived = hashlib.pbkdf2_hmac(
+            "sha256",
+            secret.encode(),
+            f"{self.salt}{username}".encode(),
+            self.iterations,
+        )
+        return derived.hex()[:10]
+
+
+class ScryptTripcodeHasher(TripcodeHasher):
+    expensive = True
+
+    def __init__(self, salt: str, n: int, r: int = 8, p: int = 1):
+        super().__init__(salt)
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def digest(self, username: str, secret: str) -> str:
+        derived = hashlib.scrypt(
+            secret.encode(),
+            salt=f"{self.salt}{username}".encode(),
+            n=self.n,
+            r=self.r,
+            p=self.p,
+            maxmem=256 * self.n * self.r,
+            dklen=16,
+        )
+        return derived.hex()[:10]
+
+
+class TripcodeEngine:
+    """
+    Produces `username!hash` tripcodes with the configured hasher.
+    Expensive hashers run in a bounded thread pool (hashlib releases the GIL
+    for both KDFs) so the event loop stays free, and their results are kept
+    in an LRU keyed by an HMAC of the credentials, so plaintext secrets are
+    never held in memory and repeat callers skip re-derivation.
+    """
+
+    def __init__(
+        self,
+        hasher: TripcodeHasher,
+        cache_key: bytes,
+        cache_size: int = 10_000,
+        max_workers: int = 4,
+    ):
+        self.hasher = hasher
+        self.cache_key = cache_key
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def generate(self, username: str, secret: str) -> str:
+        if not self.hasher.expensive:
+            return f"{username}!{self.hasher.digest(username, secret)}"
+
+        key = hmac.new(
+            self.cache_key,
+            f"{len(username)}:{username}{secret}".encode(),
+            hashlib.sha256,
+        ).digest()
+        hashed_part = self._cache.get(key)
+        if hashed_part is not None:
+            self._cache.move_to_end(key)
+            return f"{username}!{hashed_part}"
+
+        hashed_part = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), self.hasher.digest, username, secret
+        )
+        self._cache[key] = hashed_part
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return f"{username}!{hashed_part}"
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="tripcode"
+            )
+        return self._executor
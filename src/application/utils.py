@@ -1,7 +1,36 @@
-import hashlib
+from src.application.tripcode import (
+    Pbkdf2TripcodeHasher,
+    ScryptTripcodeHasher,
+    Sha256TripcodeHasher,
+    TripcodeEngine,
+    TripcodeHasher,
+)
 from src.config import settings
 
-def generate_tripcode(username: str, secret: str) -> str:
-    raw = f"{username}{secret}{settings.TRIPCODE_SALT}"
-    hashed_part = hashlib.sha256(raw.encode()).hexdigest()[:10]
-    return f"{username}!{hashed_part}"
\ No newline at end of file
+
+def build_tripcode_engine() -> TripcodeEngine:
+    hasher: TripcodeHasher
+    if settings.TRIPCODE_ALGORITHM == "pbkdf2":
+        hasher = Pbkdf2TripcodeHasher(
+            settings.TRIPCODE_SALT, iterations=settings.TRIPCODE_PBKDF2_ITERATIONS
+        )
+    elif settings.TRIPCODE_ALGORITHM == "scrypt":
+        hasher = ScryptTripcodeHasher(
+            settings.TRIPCODE_SALT, n=settings.TRIPCODE_SCRYPT_N
+        )
+    else:
+        hasher = Sha256TripcodeHasher(settings.TRIPCODE_SALT)
+
+    return TripcodeEngine(
+        hasher,
+        cache_key=settings.SECRET_KEY.encode(),
+        cache_size=settings.TRIPCODE_CACHE_SIZE,
+        max_workers=settings.TRIPCODE_MAX_WORKERS,
+    )
+
+
+tripcode_engine = build_tripcode_engine()
+
+
+async def generate_tripcode(username: str, secret: str) -> str:
+    return await tripcode_engine.generate(username, secret)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 APP_DIR = Path(__file__).resolve().parent
@@ -13,6 +14,94 @@ class Settings(BaseSettings):
     TRIPCODE_SALT: str
     API_VERSION: str
 
+    # changing the algorithm changes every signature, so existing owners
+    # lose access to their inboxes; pick one before going live
+    TRIPCODE_ALGORITHM: Literal["sha256", "pbkdf2", "scrypt"] = "sha256"
+    TRIPCODE_PBKDF2_ITERATIONS: int = 200_000
+    TRIPCODE_SCRYPT_N: int = 2**14
+    TRIPCODE_CACHE_SIZE: int = 10_000
+    TRIPCODE_MAX_WORKERS: int = 4
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # connections opened at startup, capped at DB_POOL_SIZE
+    DB_POOL_WARMUP: int = 0
+
+    INBOX_CACHE_ENABLED: bool = True
+    INBOX_CACHE_MAX_SIZE: int = 10_000
+    INBOX_CACHE_TTL_SECONDS: float = 30.0
+    INBOX_CACHE_STATS_LOG_INTERVAL_SECONDS: float = 60.0
+
+    # pre-serialized public metadata responses; MAX_AGE also goes out in
+    # Cache-Control, so shared caches may serve an old topic that long
+    METADATA_RESPONSE_CACHE_ENABLED: bool = True
+    METADATA_RESPONSE_CACHE_MAX_SIZE: int = 10_000
+    METADATA_RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    METADATA_CACHE_CONTROL_MAX_AGE_SECONDS: int = 30
+
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # logger name -> INFO/DEBUG records per second it may emit, e.g.
+    # '{"src.application.services.inbox": 50}'; warnings always pass
+    LOG_RATE_LIMITS: Dict[str, float] = {}
+
+    # token buckets for POST /inboxes/{id}/messages[/batch], per client
+    # address, per inbox and per signer (username/secret pair)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_CLIENT_PER_MINUTE: float = 60.0
+    RATE_LIMIT_CLIENT_BURST: int = 20
+    RATE_LIMIT_INBOX_PER_MINUTE: float = 600.0
+    RATE_LIMIT_INBOX_BURST: int = 100
+    RATE_LIMIT_SIGNER_PER_MINUTE: float = 30.0
+    RATE_LIMIT_SIGNER_BURST: int = 10
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS_PER_SHARD: int = 10_000
+
+    # Idempotency-Key support on POST /inboxes/ and /inboxes/{id}/messages;
+    # "database" shares stored responses between processes
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_STORE: Literal["memory", "database"] = "memory"
+    IDEMPOTENCY_TTL_SECONDS: float = 86_400.0
+    IDEMPOTENCY_MAX_KEYS: int = 100_000
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 3_600.0
+
+    # per-route counters and latency histograms served on /metrics
+    METRICS_ENABLED: bool = True
+    # statements slower than this are logged with their normalized SQL
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    # warn when one request issues more statements than this (N+1 smell)
+    REQUEST_QUERY_WARN_THRESHOLD: int = 3
+    # X-DB-Query-Count / X-DB-Time-Ms on every response; not for production
+    DEBUG_QUERY_HEADERS: bool = False
+
+    MESSAGE_BATCHING_ENABLED: bool = False
+    MESSAGE_BATCH_MAX_SIZE: int = 100
+    MESSAGE_BATCH_MAX_DELAY_MS: float = 10.0
+
+    REPLY_BATCH_MAX_ITEMS: int = 100
+
+    # rows fetched per round trip by the streaming export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # purges expired inboxes and their messages; off by default because it
+    # deletes data
+    REAPER_ENABLED: bool = False
+    REAPER_GRACE_PERIOD_SECONDS: float = 7 * 24 * 3600
+    REAPER_INTERVAL_SECONDS: float = 300.0
+    REAPER_BATCH_SIZE: int = 100
+    REAPER_MAX_INBOXES_PER_SECOND: float = 500.0
+    # message rows per DELETE transaction, however large an inbox is
+    REAPER_MESSAGE_BATCH_SIZE: int = 5_000
+
+    # Postgres only, once the messages table is partitioned by month;
+    # retention drops whole partitions and is off while unset
+    MESSAGE_PARTITIONS_AHEAD_MONTHS: int = 3
+    MESSAGE_RETENTION_MONTHS: Optional[int] = None
+    MESSAGE_PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 6 * 3600
+
     model_config = SettingsConfigDict(
         env_file=ENV_FILE_PATH, 
         env_file_encoding='utf-8',
@@ -32,3 +32,9 @@ class InvalidSignatureError(DomainError):
     """Raised when the provided credentials do not match the inbox owner."""
 
     pass
+
+
+class InvalidCursorError(DomainError):
+    """Raised when a pagination cursor is malformed or cannot be decoded."""
+
+    pass
@@ -1,5 +1,5 @@
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import List, Optional
 
@@ -12,27 +12,39 @@ from src.domain.exceptions import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Inbox:
     id: uuid.UUID
     topic: str
     owner_signature: str
     expires_at: datetime
     allow_anonymous: bool
-    messages: List[Message] = field(default_factory=list)
+    message_count: int = 0
+    last_message_at: Optional[datetime] = None
+    version: int = 1
+    # None until a caller loads the children; no read path needs them today,
+    # so listed and cached inboxes do not carry an empty list each
+    messages: Optional[List[Message]] = None
 
     @property
     def is_expired(self) -> bool:
         return datetime.now(timezone.utc) > self.expires_at
 
+    @property
+    def has_messages(self) -> bool:
+        return self.message_count > 0
+
     def validate_ownership(self, provided_signature: str) -> None:
         if self.owner_signature != provided_signature:
             raise InvalidSignatureError("ACCESS_DENIED")
 
-    def change_topic(self, new_topic: str, has_messages: bool) -> None:
+    def change_topic(self, new_topic: str, has_messages: Optional[bool] = None) -> None:
         """
         Updates topic. Raises error if inbox is not empty.
+        Defaults to the inbox's own message counter when has_messages is omitted.
         """
+        if has_messages is None:
+            has_messages = self.has_messages
         if has_messages:
             raise TopicChangeNotAllowedError("Inbox already has replies.")
         self.topic = new_topic
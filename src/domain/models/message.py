@@ -4,7 +4,7 @@ from typing import Optional
 import uuid
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Represents a single message within an Inbox.
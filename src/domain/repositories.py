@@ -1,10 +1,23 @@
 from abc import ABC, abstractmethod
 import uuid
-from typing import Optional, List
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Optional, List
 from src.domain.models import Inbox
 from src.domain.models.message import Message
 
 
+class InboxSort(str, Enum):
+    """
+    Supported orderings for an owner's inbox listing.
+    TOPIC lists newest-alphabet first (descending), EXPIRES_AT lists the
+    soonest-expiring inboxes first (ascending). Ties are broken by id.
+    """
+
+    TOPIC = "topic"
+    EXPIRES_AT = "expires_at"
+
+
 class InboxRepository(ABC):
     """
     Defines the contract for persisting Inbox aggregates.
@@ -17,6 +30,17 @@ class InboxRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def update_topic_if_unreplied(
+        self, inbox_id: uuid.UUID, owner_signature: str, topic: str
+    ) -> Optional[Inbox]:
+        """
+        Changes the topic only if the Inbox exists, is owned by the given
+        signature and has no messages yet. Returns the updated Inbox, or
+        None when any of those conditions did not hold.
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, inbox_id: uuid.UUID) -> Optional[Inbox]:
         """
@@ -24,15 +48,38 @@ class InboxRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_version(self, inbox_id: uuid.UUID) -> Optional[int]:
+        """
+        Returns the current version of an Inbox, read from the store of
+        record (never from a cache), or None if it does not exist.
+        """
+        pass
+
     @abstractmethod
     async def get_by_signature(
-        self, signature: str, limit: int, offset: int
+        self, signature: str, limit: int, offset: int, sort: InboxSort
     ) -> List[Inbox]:
         """
         Retrieves all Inboxes owned by the given signature.
         """
         pass
 
+    @abstractmethod
+    async def get_by_signature_after(
+        self,
+        signature: str,
+        sort: InboxSort,
+        sort_key: str | datetime,
+        inbox_id: uuid.UUID,
+        limit: int,
+    ) -> List[Inbox]:
+        """
+        Retrieves the next page of Inboxes owned by the given signature that
+        come strictly after the (sort_key, inbox_id) keyset position.
+        """
+        pass
+
     @abstractmethod
     async def get_messages_for_inbox(
         self, inbox_id: uuid.UUID, limit: int, offset: int
@@ -42,9 +89,46 @@ class InboxRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_messages_before(
+        self, inbox_id: uuid.UUID, created_at: datetime, message_id: int, limit: int
+    ) -> List[Message]:
+        """
+        Retrieves the next page of messages (newest first) that come strictly
+        after the (created_at, message_id) keyset position.
+        """
+        pass
+
     @abstractmethod
     async def add_message(self, message: Message) -> Message:
         """
         Saves a single Message entity to the database.
         """
         pass
+
+    @abstractmethod
+    def stream_messages(
+        self, inbox_id: uuid.UUID, batch_size: int
+    ) -> AsyncIterator[Message]:
+        """
+        Yields every message of an Inbox, oldest first, fetching `batch_size`
+        rows at a time so memory does not grow with the size of the Inbox.
+        """
+        pass
+
+    @abstractmethod
+    async def add_messages(self, messages: List[Message]) -> List[Message]:
+        """
+        Saves several Message entities in a single transaction.
+        Returns them with their ids, in input order.
+        """
+        pass
+
+    @abstractmethod
+    async def add_message_if_accepted(self, message: Message) -> Optional[Message]:
+        """
+        Saves a Message only if its Inbox exists, has not expired at the
+        message's created_at and accepts its (possibly missing) signature.
+        Returns None when the message was rejected.
+        """
+        pass
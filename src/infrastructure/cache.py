@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache whose entries also expire after a fixed time-to-live.
+    Meant to be shared by coroutines on a single event loop, so it takes no locks.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """
+        Stores a value. When `generation` is given (read from `self.generation`
+        before loading the value), the write is dropped if any invalidation
+        happened in between, so a slow reader cannot resurrect stale data.
+        """
+        if generation is not None and generation != self.generation:
+            return
+
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+async def log_stats_periodically(
+    name: str, cache: TTLCache, interval_seconds: float
+) -> None:
+    """
+    Logs the cache counters every `interval_seconds` until cancelled.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        logger.info(
+            "Cache %s size=%d hits=%d misses=%d evictions=%d hit_ratio=%.3f",
+            name,
+            stats["size"],
+            stats["hits"],
+            stats["misses"],
+            stats["evictions"],
+            stats["hits"] / lookups if lookups else 0.0,
+        )
@@ -1,4 +1,10 @@
-from .models import InboxDB, MessageDB
-from .session import get_session
+from .models import IdempotencyKeyDB, InboxDB, MessageDB
+from .session import get_session, get_session_factory
 
-__all__ = ["InboxDB", "MessageDB", "get_session"]
+__all__ = [
+    "IdempotencyKeyDB",
+    "InboxDB",
+    "MessageDB",
+    "get_session",
+    "get_session_factory",
+]
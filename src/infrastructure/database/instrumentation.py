@@ -0,0 +1,75 @@
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import settings
+from src.infrastructure.metrics import request_timings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# DBAPI placeholders: ?, $1, %s, %(name)s, :name
+_PLACEHOLDER = re.compile(r"\?|\$\d+|%s|%\(\w+\)s|(?<!:):\w+")
+# an expanded IN list of any length is the same query
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduces a statement to its shape: literals and placeholders become `?`,
+    IN lists collapse to one element and whitespace to single spaces, so
+    slow-query log lines for the same query group together.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Counts every statement run on `engine`, failed ones included, and adds
+    its time to the request that issued it; statements over
+    SLOW_QUERY_THRESHOLD_MS are logged.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # per execution, so a statement that fails cannot leave a stale
+        # start time behind on the pooled connection
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _record(statement, time.perf_counter() - context._query_start)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        started = getattr(context, "_query_start", None)
+        if started is not None:
+            _record(
+                exception_context.statement,
+                time.perf_counter() - started,
+                failed=True,
+            )
+
+
+def _record(statement: str, elapsed: float, failed: bool = False) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.db += elapsed
+        timings.queries += 1
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query%s took %.1f ms: %s",
+            " (failed)" if failed else "",
+            elapsed * 1000,
+            normalize_sql(statement),
+        )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, LargeBinary
 from sqlmodel import SQLModel, Field, Index
 
 
@@ -12,7 +12,9 @@ class MessageDB(SQLModel, table=True):
 
     __tablename__ = "messages"
 
-    __table_args__ = (Index("ix_messages_inbox_created", "inbox_id", "created_at"),)
+    __table_args__ = (
+        Index("ix_messages_inbox_created", "inbox_id", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     body: str
@@ -31,6 +33,13 @@ class InboxDB(SQLModel, table=True):
 
     __tablename__ = "inboxes"
 
+    __table_args__ = (
+        Index("ix_inboxes_owner_topic", "owner_signature", "topic", "id"),
+        Index("ix_inboxes_owner_expires", "owner_signature", "expires_at", "id"),
+        # lets the reaper find expired inboxes without a full scan
+        Index("ix_inboxes_expires_at", "expires_at"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     topic: str
     owner_signature: str
@@ -38,3 +47,31 @@ class InboxDB(SQLModel, table=True):
         sa_column=Column(DateTime(timezone=True), nullable=False)
     )
     allow_anonymous: bool
+    # denormalized from messages, maintained in the same transaction as inserts
+    message_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    last_message_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    # bumped by every write that changes what readers of the inbox see;
+    # served as the ETag of its metadata and message pages
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+
+
+class IdempotencyKeyDB(SQLModel, table=True):
+    """
+    Database model for stored responses of idempotent requests.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    # method, path and the client's Idempotency-Key
+    key: str = Field(primary_key=True)
+    fingerprint: str
+    status_code: int
+    body: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    media_type: Optional[str] = None
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+MESSAGES_TABLE = "messages"
+DEFAULT_PARTITION = "messages_default"
+PARTITION_NAME = re.compile(r"^messages_p(\d{4})(\d{2})$")
+
+
+def month_start(moment: datetime | date) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"messages_p{month.year:04d}{month.month:02d}"
+
+
+def create_partition_sql(month: date) -> str:
+    """
+    DDL for the partition holding `month`. Bounds carry an explicit UTC
+    offset so a timestamptz column does not depend on the session time zone.
+    """
+    upper = add_months(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {MESSAGES_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+
+def forget_messages_sql(relation: str, where: str = "") -> str:
+    """
+    Takes the rows of `relation` (optionally filtered by `where`) off the
+    counters of their inboxes and bumps their version, so message ETags
+    change, before those rows are dropped.
+    """
+    return (
+        "UPDATE inboxes SET "
+        "message_count = inboxes.message_count - gone.n, "
+        "last_message_at = CASE WHEN inboxes.message_count = gone.n "
+        "THEN NULL ELSE inboxes.last_message_at END, "
+        "version = inboxes.version + 1 "
+        f"FROM (SELECT inbox_id, count(*) AS n FROM {relation} {where} "
+        "GROUP BY inbox_id) AS gone "
+        "WHERE inboxes.id = gone.inbox_id"
+    )
+
+
+def _month_bounds(month: date) -> tuple[datetime, datetime]:
+    upper = add_months(month, 1)
+    return (
+        datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+        datetime(upper.year, upper.month, 1, tzinfo=timezone.utc),
+    )
+
+
+async def _is_partitioned(connection: AsyncConnection) -> bool:
+    result = await connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :table"
+        ),
+        {"table": MESSAGES_TABLE},
+    )
+    return result.first() is not None
+
+
+async def _partition_names(connection: AsyncConnection) -> List[str]:
+    result = await connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": MESSAGES_TABLE},
+    )
+    return list(result.scalars().all())
+
+
+async def _create_partition(connection: AsyncConnection, month: date) -> None:
+    lower, upper = _month_bounds(month)
+    overflow = await connection.execute(
+        text(
+            f"SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper LIMIT 1"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    if overflow.first() is None:
+        await connection.execute(text(create_partition_sql(month)))
+        return
+
+    # maintenance fell behind and the month's rows landed in the default
+    # partition, which would make the new partition's bounds invalid: move
+    # them over while the default is detached
+    await connection.execute(
+        text(f"ALTER TABLE {MESSAGES_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    )
+    await connection.execute(text(create_partition_sql(month)))
+    await connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+            f"INSERT INTO {MESSAGES_TABLE} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    await connection.execute(
+        text(
+            f"ALTER TABLE {MESSAGES_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        )
+    )
+
+
+async def ensure_message_partitions(
+    engine: AsyncEngine, months_ahead: int, now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Creates the partitions for the current month and `months_ahead` months
+    after it, plus a DEFAULT partition so replies still land if maintenance
+    falls behind; their rows move to the monthly partition once it exists.
+    A no-op (returning []) unless `messages` is a partitioned Postgres
+    table, so SQLite and unmigrated databases are left alone.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    current = month_start(now or datetime.now(timezone.utc))
+    async with engine.begin() as connection:
+        if not await _is_partitioned(connection):
+            return []
+        await connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+                f"PARTITION OF {MESSAGES_TABLE} DEFAULT"
+            )
+        )
+        existing = set(await _partition_names(connection))
+        months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+        for month in months:
+            if partition_name(month) not in existing:
+                await _create_partition(connection, month)
+    return [partition_name(month) for month in months]
+
+
+async def drop_expired_message_partitions(
+    engine: AsyncEngine, retain_months: int, now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Retention by partition: detaches and drops every monthly partition that
+    ends before the oldest retained month, instead of DELETEing rows; the
+    few rows past retention in the DEFAULT partition are deleted.
+    Counters and versions of the affected inboxes are adjusted first, so
+    they describe the messages that are left and cached ETags go stale.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    oldest_kept = add_months(
+        month_start(now or datetime.now(timezone.utc)), -retain_months
+    )
+    dropped: List[str] = []
+    async with engine.begin() as connection:
+        if not await _is_partitioned(connection):
+            return []
+        names = await _partition_names(connection)
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match is None:
+                continue
+            month = date(int(match[1]), int(match[2]), 1)
+            if add_months(month, 1) <= oldest_kept:
+                await connection.execute(text(forget_messages_sql(name)))
+                await connection.execute(
+                    text(f"ALTER TABLE {MESSAGES_TABLE} DETACH PARTITION {name}")
+                )
+                await connection.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+
+        if DEFAULT_PARTITION in names:
+            before = {"before": _month_bounds(oldest_kept)[0]}
+            await connection.execute(
+                text(
+                    forget_messages_sql(DEFAULT_PARTITION, "WHERE created_at < :before")
+                ),
+                before,
+            )
+            await connection.execute(
+                text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :before"),
+                before,
+            )
+    return dropped
+
+
+async def maintain_message_partitions_periodically(
+    engine: AsyncEngine,
+    months_ahead: int,
+    retain_months: Optional[int],
+    interval_seconds: float,
+) -> None:
+    """
+    Keeps future partitions in place and applies retention every
+    `interval_seconds` until cancelled.
+    """
+    while True:
+        try:
+            created = await ensure_message_partitions(engine, months_ahead)
+            dropped = []
+            if retain_months is not None:
+                dropped = await drop_expired_message_partitions(engine, retain_months)
+            logger.debug("Message partitions ensured=%s", created)
+            if dropped:
+                logger.info("Dropped message partitions past retention: %s", dropped)
+        except Exception:
+            logger.exception("Message partition maintenance failed")
+        await asyncio.sleep(interval_seconds)
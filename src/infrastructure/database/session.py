@@ -1,14 +1,94 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import logging
+from typing import AsyncGenerator, Any, Dict, Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from src.config import settings
+from .instrumentation import instrument_engine
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+engine: Optional[AsyncEngine] = None
+async_session_factory: Optional[sessionmaker] = None
+
+
+def build_engine(database_url: str = DATABASE_URL) -> AsyncEngine:
+    """
+    Creates the async engine with the pool tuned from settings.
+    Pool options only apply to server databases; SQLite keeps its defaults.
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {}
+    if url.get_backend_name() == "postgresql":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+            }
+    engine = create_async_engine(url, echo=False, future=True, **options)
+    instrument_engine(engine)
+    return engine
+
+
+def init_engine() -> AsyncEngine:
+    """
+    Creates the process-wide engine and session factory once.
+    Called from lifespan; safe to call again.
+    """
+    global engine, async_session_factory
+    if engine is None:
+        engine = build_engine()
+        async_session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+    return engine
+
+
+def get_session_factory() -> sessionmaker:
+    init_engine()
+    return async_session_factory
+
+
+async def warm_up_pool(connections: int) -> None:
+    """
+    Opens `connections` connections concurrently and returns them to the pool,
+    so the first requests after startup do not pay the connect latency.
+    Clamped to DB_POOL_SIZE: connections past it would be overflow that is
+    discarded on return, or would wait on pool_timeout with no overflow left.
+    """
+    if connections <= 0:
+        return
+    if connections > settings.DB_POOL_SIZE:
+        logger.warning(
+            "DB_POOL_WARMUP=%d exceeds DB_POOL_SIZE=%d; warming %d connections",
+            connections,
+            settings.DB_POOL_SIZE,
+            settings.DB_POOL_SIZE,
+        )
+        connections = settings.DB_POOL_SIZE
+    current = init_engine()
+    opened = await asyncio.gather(*(current.connect() for _ in range(connections)))
+    for connection in opened:
+        await connection.close()
+
+
+async def dispose_engine() -> None:
+    global engine, async_session_factory
+    if engine is not None:
+        await engine.dispose()
+    engine = None
+    async_session_factory = None
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    async with async_session() as session:
+    async with get_session_factory()() as session:
         yield session
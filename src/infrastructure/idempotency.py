@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.database.models import IdempotencyKeyDB
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class StoredResponse:
+    """The first response to an idempotent request, replayed for retries."""
+
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: Optional[str] = None
+
+
+class IdempotencyStore(ABC):
+    """
+    Stored responses by idempotency key; entries expire after the store's
+    time-to-live.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[StoredResponse]: ...
+
+    @abstractmethod
+    async def put(self, key: str, response: StoredResponse) -> None:
+        """Stores `response` unless an unexpired one exists for `key`."""
+        ...
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Bounded LRU of responses, local to the process."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.cache: TTLCache[str, StoredResponse] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds
+        )
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        return self.cache.get(key)
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        if self.cache.get(key) is None:
+            self.cache.set(key, response)
+
+
+class SqlIdempotencyStore(IdempotencyStore):
+    """
+    Responses in the idempotency_keys table, shared by every process.
+    Uses its own sessions: a stored response must not depend on the
+    request's transaction.
+    """
+
+    def __init__(self, session_factory: sessionmaker, ttl_seconds: float):
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds)
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(
+                    IdempotencyKeyDB.fingerprint,
+                    IdempotencyKeyDB.status_code,
+                    IdempotencyKeyDB.body,
+                    IdempotencyKeyDB.media_type,
+                ).where(
+                    IdempotencyKeyDB.key == key,
+                    IdempotencyKeyDB.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            row = result.first()
+        return StoredResponse(*row) if row is not None else None
+
+    async def put(self, key: str, response: StoredResponse) -> None:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            # an expired entry for the key would block the insert
+            await session.execute(
+                delete(IdempotencyKeyDB).where(
+                    IdempotencyKeyDB.key == key, IdempotencyKeyDB.expires_at <= now
+                )
+            )
+            session.add(
+                IdempotencyKeyDB(
+                    key=key,
+                    fingerprint=response.fingerprint,
+                    status_code=response.status_code,
+                    body=response.body,
+                    media_type=response.media_type,
+                    expires_at=now + self.ttl,
+                )
+            )
+            try:
+                await session.commit()
+            except IntegrityError:
+                # a concurrent request stored its response first
+                await session.rollback()
+
+    async def purge_expired(self) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(IdempotencyKeyDB).where(
+                    IdempotencyKeyDB.expires_at <= datetime.now(timezone.utc)
+                )
+            )
+            await session.commit()
+            return result.rowcount
+
+
+async def purge_expired_periodically(
+    store: SqlIdempotencyStore, interval_seconds: float
+) -> None:
+    """
+    Deletes expired stored responses every `interval_seconds` until cancelled.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            purged = await store.purge_expired()
+            if purged:
+                logger.debug("Purged %d expired idempotency keys", purged)
+        except Exception:
+            logger.exception("Idempotency key purge failed")
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from dataclasses import replace
+from typing import Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.models import Message
+from src.infrastructure.repositories.inbox import insert_messages
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBatchWriter:
+    """
+    Write-behind buffer for new messages.
+    Submitted messages are flushed as one multi-row INSERT per transaction,
+    either once `max_batch_size` messages are waiting or `max_delay_ms` after
+    the first one arrived. Each submitter is resumed only after the commit of
+    the batch holding its message, so a returned message is durable.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_batch_size: int = 100,
+        max_delay_ms: float = 10.0,
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[tuple[Message, asyncio.Future]] = []
+        self._has_pending = asyncio.Event()
+        self._is_full = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="message-batch-writer")
+
+    async def submit(self, message: Message) -> Message:
+        if self._closing or self._task is None or self._task.done():
+            raise RuntimeError("Message batch writer is not running.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._is_full.set()
+        return await future
+
+    async def close(self) -> None:
+        """
+        Stops accepting messages and waits until everything already buffered
+        has been flushed.
+        """
+        if self._task is None:
+            return
+        self._closing = True
+        self._has_pending.set()
+        self._is_full.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await self._has_pending.wait()
+                if not self._pending:
+                    if self._closing:
+                        return
+                    self._has_pending.clear()
+                    continue
+
+                if len(self._pending) < self.max_batch_size and not self._closing:
+                    try:
+                        await asyncio.wait_for(self._is_full.wait(), self.max_delay)
+                    except asyncio.TimeoutError:
+                        pass
+
+                batch = self._pending[: self.max_batch_size]
+                self._pending = self._pending[self.max_batch_size :]
+                # while closing, both events stay set so the loop keeps
+                # draining and then exits instead of waiting forever
+                if not self._closing:
+                    if len(self._pending) < self.max_batch_size:
+                        self._is_full.clear()
+                    if not self._pending:
+                        self._has_pending.clear()
+
+                await self._flush(batch)
+        finally:
+            # never leave submitters awaiting a writer that is gone
+            pending, self._pending = self._pending, []
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("Message batch writer stopped."))
+
+    async def _flush(self, batch: List[tuple[Message, asyncio.Future]]) -> None:
+        try:
+            ids = await self._insert([message for message, _ in batch])
+        except Exception:
+            logger.exception(
+                "Failed to flush batch of %d messages, retrying one by one",
+                len(batch),
+            )
+            # isolate the failing row(s) so one bad message (e.g. its inbox
+            # was deleted meanwhile) does not fail unrelated replies
+            for item in batch:
+                await self._flush_one(*item)
+            return
+
+        logger.debug("Flushed batch of %d messages", len(batch))
+        for (message, future), message_id in zip(batch, ids):
+            if not future.done():
+                future.set_result(replace(message, id=message_id))
+
+    async def _flush_one(self, message: Message, future: asyncio.Future) -> None:
+        try:
+            (message_id,) = await self._insert([message])
+        except Exception as e:
+            logger.warning("Failed to insert message for inbox id=%s", message.inbox_id)
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(replace(message, id=message_id))
+
+    async def _insert(self, messages: List[Message]) -> List[int]:
+        async with self.session_factory() as session:
+            ids = await insert_messages(session, messages)
+            await session.commit()
+        return ids
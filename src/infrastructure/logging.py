@@ -1,27 +1,107 @@
+import json
 import os
 import sys
+import time
 import logging
 import logging.config
+import logging.handlers
+import queue
+from contextvars import ContextVar
+from typing import Dict, Mapping, Optional
 
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
-def setup_logging(level: str | None = None) -> None:
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps records with the current request ID. Runs on the logging thread
+    of the caller, before the record is queued and the context is lost.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket letting through at most `per_second` records below WARNING
+    (bursts up to the same number); warnings and errors always pass.
+    The next record let through reports how many were dropped.
+    """
+
+    def __init__(self, per_second: float):
+        super().__init__()
+        self.per_second = per_second
+        self.tokens = per_second
+        self.updated = time.monotonic()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        self.tokens = min(
+            self.per_second, self.tokens + (now - self.updated) * self.per_second
+        )
+        self.updated = now
+        if self.tokens < 1:
+            self.dropped += 1
+            return False
+        self.tokens -= 1
+        if self.dropped and isinstance(record.msg, str):
+            record.msg = f"{record.msg} [{self.dropped} similar dropped]"
+            self.dropped = 0
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, for log shippers. Tracebacks are already part
+    of the message: QueueHandler renders them before queueing the record.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        return json.dumps(entry, default=str)
+
+
+def _queue_handler(log_queue: queue.Queue) -> logging.handlers.QueueHandler:
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    return handler
+
+
+def setup_logging(
+    level: str | None = None,
+    json_format: bool = False,
+    rate_limits: Optional[Mapping[str, float]] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Routes every record through a queue; the returned (started) listener
+    formats and writes them to stdout on its own thread, so console I/O
+    never blocks the event loop. Stop it on shutdown to flush.
+    `rate_limits` maps logger names to the records per second they may
+    emit below WARNING.
+    """
     log_level = (level or os.getenv("LOG_LEVEL") or "INFO").upper()
+    log_queue: queue.Queue = queue.Queue(-1)
 
     logging.config.dictConfig(
         {
             "version": 1,
             "disable_existing_loggers": False,
-            "formatters": {
-                "standard": {
-                    "format": "%(asctime)s %(levelname)s %(name)s - %(message)s",
-                },
-            },
             "handlers": {
                 "console": {
-                    "class": "logging.StreamHandler",
+                    "()": _queue_handler,
                     "level": log_level,
-                    "formatter": "standard",
-                    "stream": sys.stdout,
+                    "log_queue": log_queue,
                 },
             },
             "root": {
@@ -52,3 +132,17 @@ def setup_logging(level: str | None = None) -> None:
             },
         }
     )
+
+    limits: Dict[str, float] = dict(rate_limits or {})
+    for name, per_second in limits.items():
+        logging.getLogger(name).addFilter(RateLimitFilter(per_second))
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(
+        JsonFormatter()
+        if json_format
+        else logging.Formatter("%(asctime)s %(levelname)s %(name)s - %(message)s")
+    )
+    listener = logging.handlers.QueueListener(log_queue, output)
+    listener.start()
+    return listener
@@ -1,3 +1,4 @@
+from typing import Any, Iterable, List
 from src.domain.models import Inbox
 from src.infrastructure.database.models import InboxDB
 from datetime import timezone
@@ -17,14 +18,27 @@ class InboxMapper:
         if expires_at.tzinfo is None:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
 
+        last_message_at = db_entity.last_message_at
+        if last_message_at is not None and last_message_at.tzinfo is None:
+            last_message_at = last_message_at.replace(tzinfo=timezone.utc)
+
         return Inbox(
             id=db_entity.id,
             topic=db_entity.topic,
             owner_signature=db_entity.owner_signature,
             expires_at=expires_at,
             allow_anonymous=db_entity.allow_anonymous,
+            message_count=db_entity.message_count,
+            last_message_at=last_message_at,
+            version=db_entity.version,
         )
 
+    def to_domain_many(self, rows: Iterable[Any]) -> List[Inbox]:
+        """
+        Builds Inboxes from ORM instances or plain column rows.
+        """
+        return [self.to_domain(row) for row in rows]
+
     def to_db(self, domain_entity: Inbox) -> InboxDB:
 
         return InboxDB(
@@ -33,4 +47,7 @@ class InboxMapper:
             owner_signature=domain_entity.owner_signature,
             expires_at=domain_entity.expires_at,
             allow_anonymous=domain_entity.allow_anonymous,
+            message_count=domain_entity.message_count,
+            last_message_at=domain_entity.last_message_at,
+            version=domain_entity.version,
         )
@@ -1,3 +1,4 @@
+from typing import Any, Iterable, List
 from src.domain.models import Message
 from src.infrastructure.database.models import MessageDB
 from datetime import timezone
@@ -25,6 +26,29 @@ class MessageMapper:
             signature=db_entity.signature,
         )
 
+    def to_domain_many(self, rows: Iterable[Any]) -> List[Message]:
+        """
+        Builds Messages from ORM instances or plain column rows, without
+        the per-row call overhead of to_domain.
+        """
+        utc = timezone.utc
+        messages = []
+        append = messages.append
+        for row in rows:
+            created_at = row.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=utc)
+            append(
+                Message(
+                    inbox_id=row.inbox_id,
+                    id=row.id,
+                    body=row.body,
+                    created_at=created_at,
+                    signature=row.signature,
+                )
+            )
+        return messages
+
     def to_db(self, domain_entity: Message) -> MessageDB:
         return MessageDB(
             id=domain_entity.id,
@@ -0,0 +1,196 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# seconds; the implicit +Inf bucket is added on top
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+PHASES = ("db", "serialization", "service")
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    """
+    Time spent in each phase of the current request, accumulated by
+    instrumentation points through the `request_timings` context variable.
+    """
+
+    db: float = 0.0
+    serialization: float = 0.0
+    queries: int = 0
+
+
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Adds the duration of the block to `phase` of the current request.
+    Outside a request it only costs the clock reads.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = request_timings.get()
+        if timings is not None:
+            setattr(
+                timings,
+                phase,
+                getattr(timings, phase) + time.perf_counter() - started,
+            )
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Per-route request counters and latency histograms, rendered in the
+    Prometheus text format.
+    Every update happens on the event loop thread, so plain dict and int
+    operations are safe without locks; an observation is a few dict
+    lookups and a bisect.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.phases: Dict[Tuple[str, str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], int] = {}
+        # background components reporting their own (name, type, value)
+        self.collectors: Dict[str, Callable[[], Iterable[Tuple[str, str, float]]]] = {}
+        self.in_flight = 0
+
+    def _histogram(self, table: dict, key: tuple) -> Histogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram(self.buckets)
+        return histogram
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        timings: RequestTimings,
+    ) -> None:
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self._histogram(self.durations, (method, route)).observe(seconds)
+        if timings.queries:
+            self.queries[(method, route)] = (
+                self.queries.get((method, route), 0) + timings.queries
+            )
+
+        # "service" is everything that is neither DB nor serialization:
+        # routing, validation, domain rules, tripcodes
+        service = max(0.0, seconds - timings.db - timings.serialization)
+        for phase, value in zip(PHASES, (timings.db, timings.serialization, service)):
+            self._histogram(self.phases, (method, route, phase)).observe(value)
+
+    def render(self) -> str:
+        lines: List[str] = [
+            "# HELP http_requests_total Requests handled, by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        lines += [
+            "# HELP db_queries_total SQL statements issued, by route.",
+            "# TYPE db_queries_total counter",
+        ]
+        for (method, route), count in sorted(self.queries.items()):
+            labels = _labels(method=method, route=route)
+            lines.append(f"db_queries_total{{{labels}}} {count}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.durations.items()):
+            lines += self._render_histogram(
+                "http_request_duration_seconds",
+                histogram,
+                method=method,
+                route=route,
+            )
+
+        lines += [
+            "# HELP http_request_phase_seconds Request time split into db, "
+            "serialization and service (the rest).",
+            "# TYPE http_request_phase_seconds histogram",
+        ]
+        for (method, route, phase), histogram in sorted(self.phases.items()):
+            lines += self._render_histogram(
+                "http_request_phase_seconds",
+                histogram,
+                method=method,
+                route=route,
+                phase=phase,
+            )
+        for collect in self.collectors.values():
+            for name, kind, value in collect():
+                lines += [f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def _render_histogram(
+        self, name: str, histogram: Histogram, **labels: str
+    ) -> List[str]:
+        base = _labels(**labels)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{base},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{base},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{base}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{base}}} {histogram.count}")
+        return lines
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
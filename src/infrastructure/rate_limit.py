@@ -0,0 +1,96 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class BucketCharge:
+    """`cost` tokens from the bucket of `key`, refilled at `rate` per second."""
+
+    key: Hashable
+    rate: float
+    burst: int
+    cost: int = 1
+
+
+class RateLimiter(ABC):
+    """
+    Token buckets keyed by arbitrary hashable keys. Async so that a shared
+    backend (e.g. Redis) can implement it for multi-process deployments.
+    """
+
+    @abstractmethod
+    async def acquire(
+        self, charges: Sequence[BucketCharge]
+    ) -> Optional[Tuple[BucketCharge, float]]:
+        """
+        Takes every charge, or none of them: returns None when all buckets
+        had enough tokens, otherwise the charge with the longest wait and
+        that wait in seconds (infinity when its cost exceeds its burst).
+        """
+        ...
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """
+    Process-local token buckets spread over `shards` LRU tables of at most
+    `max_keys_per_shard` entries each, so memory stays bounded however many
+    clients show up; an evicted key simply starts again with a full bucket.
+    Single event loop only, so it takes no locks and acquire is atomic.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        max_keys_per_shard: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._clock = clock
+        self._shards: List[OrderedDict[Hashable, tuple[float, float]]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    async def acquire(
+        self, charges: Sequence[BucketCharge]
+    ) -> Optional[Tuple[BucketCharge, float]]:
+        now = self._clock()
+        refilled = []
+        rejected: Optional[Tuple[BucketCharge, float]] = None
+        for charge in charges:
+            tokens = self._refill(charge, now)
+            refilled.append(tokens)
+            if charge.cost > charge.burst:
+                wait = math.inf
+            elif tokens < charge.cost:
+                wait = (charge.cost - tokens) / charge.rate
+            else:
+                continue
+            if rejected is None or wait > rejected[1]:
+                rejected = (charge, wait)
+
+        for charge, tokens in zip(charges, refilled):
+            if rejected is None:
+                tokens -= charge.cost
+            self._shard(charge.key)[charge.key] = (tokens, now)
+        return rejected
+
+    def _shard(self, key: Hashable) -> OrderedDict[Hashable, tuple[float, float]]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _refill(self, charge: BucketCharge, now: float) -> float:
+        shard = self._shard(charge.key)
+        bucket = shard.get(charge.key)
+        if bucket is None:
+            if len(shard) >= self.max_keys_per_shard:
+                shard.popitem(last=False)
+            return float(charge.burst)
+        shard.move_to_end(charge.key)
+        tokens, updated = bucket
+        return min(float(charge.burst), tokens + (now - updated) * charge.rate)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from src.infrastructure.database.models import InboxDB, MessageDB
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiredInboxReaper:
+    """
+    Background purge of inboxes that expired more than `grace_period` ago,
+    together with their messages.
+    Work is done in short transactions of at most `batch_size` inboxes,
+    found through ix_inboxes_expires_at, and paced to
+    `max_inboxes_per_second` so locks and I/O never pile up behind live
+    traffic. Their messages go first, at most `message_batch_size` rows per
+    transaction, so a few huge inboxes cannot turn into one giant DELETE.
+    Counters are exposed through `stats()` and `collect_metrics()` and
+    logged per pass.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        grace_period: timedelta,
+        interval_seconds: float = 300.0,
+        batch_size: int = 100,
+        max_inboxes_per_second: float = 500.0,
+        message_batch_size: int = 5_000,
+    ):
+        self.session_factory = session_factory
+        self.grace_period = grace_period
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_inboxes_per_second = max_inboxes_per_second
+        self.message_batch_size = message_batch_size
+        self.passes = 0
+        self.inboxes_deleted = 0
+        self.messages_deleted = 0
+        self.failures = 0
+        self.last_pass_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="expired-inbox-reaper")
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "passes": self.passes,
+            "inboxes_deleted": self.inboxes_deleted,
+            "messages_deleted": self.messages_deleted,
+            "failures": self.failures,
+            "last_pass_seconds": self.last_pass_seconds,
+        }
+
+    def collect_metrics(self) -> Iterator[Tuple[str, str, float]]:
+        yield "reaper_passes_total", "counter", self.passes
+        yield "reaper_inboxes_deleted_total", "counter", self.inboxes_deleted
+        yield "reaper_messages_deleted_total", "counter", self.messages_deleted
+        yield "reaper_failures_total", "counter", self.failures
+        yield "reaper_last_pass_seconds", "gauge", self.last_pass_seconds
+
+    async def run_once(self) -> int:
+        """
+        Purges everything currently past the grace period, chunk by chunk.
+        Returns the number of inboxes deleted.
+        """
+        cutoff = datetime.now(timezone.utc) - self.grace_period
+        started = time.perf_counter()
+        deleted = 0
+        while True:
+            chunk_started = time.perf_counter()
+            inboxes = await self._purge_chunk(cutoff)
+            deleted += inboxes
+            if inboxes < self.batch_size:
+                break
+            # pace chunks so the purge rate stays under the configured limit
+            budget = inboxes / self.max_inboxes_per_second
+            await asyncio.sleep(
+                max(0.0, budget - (time.perf_counter() - chunk_started))
+            )
+
+        self.passes += 1
+        self.last_pass_seconds = time.perf_counter() - started
+        logger.info(
+            "Reaper pass removed inboxes=%d in %.3fs (total inboxes=%d messages=%d)",
+            deleted,
+            self.last_pass_seconds,
+            self.inboxes_deleted,
+            self.messages_deleted,
+        )
+        return deleted
+
+    async def _purge_chunk(self, cutoff: datetime) -> int:
+        """
+        Deletes up to `batch_size` expired inboxes, their messages first in
+        row-bounded transactions; counters advance as each one commits.
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(InboxDB.id)
+                .where(InboxDB.expires_at < cutoff)
+                .order_by(InboxDB.expires_at)
+                .limit(self.batch_size)
+            )
+            ids: List[uuid.UUID] = list(result.scalars().all())
+        if not ids:
+            return 0
+
+        while True:
+            deleted = await self._purge_messages(ids)
+            self.messages_deleted += deleted
+            if deleted < self.message_batch_size:
+                break
+
+        async with self.session_factory() as session:
+            # anything that slipped in since is removed with its inbox
+            messages = await session.execute(
+                delete(MessageDB).where(MessageDB.inbox_id.in_(ids))
+            )
+            inboxes = await session.execute(delete(InboxDB).where(InboxDB.id.in_(ids)))
+            await session.commit()
+        self.messages_deleted += messages.rowcount
+        self.inboxes_deleted += inboxes.rowcount
+        return inboxes.rowcount
+
+    async def _purge_messages(self, inbox_ids: List[uuid.UUID]) -> int:
+        async with self.session_factory() as session:
+            chunk = (
+                select(MessageDB.id)
+                .where(MessageDB.inbox_id.in_(inbox_ids))
+                .limit(self.message_batch_size)
+            )
+            result = await session.execute(
+                delete(MessageDB).where(MessageDB.id.in_(chunk))
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                logger.exception("Expired inbox reaper pass failed")
+            await asyncio.sleep(self.interval_seconds)
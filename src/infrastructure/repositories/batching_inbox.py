@@ -0,0 +1,33 @@
+from typing import Optional
+
+from src.domain.exceptions import DomainError
+from src.domain.models import Message
+from src.domain.repositories import InboxRepository
+from src.infrastructure.ingestion import MessageBatchWriter
+from src.infrastructure.repositories.delegating import DelegatingInboxRepository
+
+
+class BatchingInboxRepository(DelegatingInboxRepository):
+    """
+    Routes new messages through a shared MessageBatchWriter instead of
+    committing each one on the request session.
+    """
+
+    def __init__(self, inner: InboxRepository, writer: MessageBatchWriter):
+        super().__init__(inner)
+        self.writer = writer
+
+    async def add_message(self, message: Message) -> Message:
+        return await self.writer.submit(message)
+
+    async def add_message_if_accepted(self, message: Message) -> Optional[Message]:
+        # the buffered multi-row INSERT cannot carry per-row conditions, so
+        # validate against the (usually cached) inbox before enqueueing
+        inbox = await self.inner.get_by_id(message.inbox_id)
+        if inbox is None:
+            return None
+        try:
+            inbox.validate_new_message(message.signature)
+        except DomainError:
+            return None
+        return await self.writer.submit(message)
@@ -0,0 +1,75 @@
+import uuid
+from dataclasses import replace
+from typing import List, Optional
+
+from src.domain.models import Inbox, Message
+from src.domain.repositories import InboxRepository
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.repositories.delegating import DelegatingInboxRepository
+
+
+class CachingInboxRepository(DelegatingInboxRepository):
+    """
+    Read-through cache in front of another InboxRepository.
+    Only single-inbox lookups are cached; every write that can change an
+    Inbox row evicts it, and the TTL bounds staleness across processes.
+    """
+
+    def __init__(self, inner: InboxRepository, cache: TTLCache[uuid.UUID, Inbox]):
+        super().__init__(inner)
+        self.cache = cache
+
+    async def get_by_id(self, inbox_id: uuid.UUID) -> Optional[Inbox]:
+        cached = self.cache.get(inbox_id)
+        if cached is not None:
+            return _copy(cached)
+
+        generation = self.cache.generation
+        inbox = await self.inner.get_by_id(inbox_id)
+        if inbox is not None:
+            self.cache.set(inbox_id, _copy(inbox), generation=generation)
+        return inbox
+
+    async def save(self, inbox: Inbox) -> Inbox:
+        try:
+            return await self.inner.save(inbox)
+        finally:
+            self.cache.invalidate(inbox.id)
+
+    async def update_topic_if_unreplied(
+        self, inbox_id: uuid.UUID, owner_signature: str, topic: str
+    ) -> Optional[Inbox]:
+        try:
+            return await self.inner.update_topic_if_unreplied(
+                inbox_id, owner_signature, topic
+            )
+        finally:
+            self.cache.invalidate(inbox_id)
+
+    # replies change message_count, last_message_at and version
+    async def add_message(self, message: Message) -> Message:
+        try:
+            return await self.inner.add_message(message)
+        finally:
+            self.cache.invalidate(message.inbox_id)
+
+    async def add_message_if_accepted(self, message: Message) -> Optional[Message]:
+        try:
+            return await self.inner.add_message_if_accepted(message)
+        finally:
+            self.cache.invalidate(message.inbox_id)
+
+    async def add_messages(self, messages: List[Message]) -> List[Message]:
+        try:
+            return await self.inner.add_messages(messages)
+        finally:
+            for inbox_id in {message.inbox_id for message in messages}:
+                self.cache.invalidate(inbox_id)
+
+
+def _copy(inbox: Inbox) -> Inbox:
+    # callers mutate the aggregate (e.g. change_topic), so neither the entry
+    # nor any of its children may be shared with what we hand out
+    if inbox.messages is None:
+        return replace(inbox)
+    return replace(inbox, messages=[replace(m) for m in inbox.messages])
@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from src.domain.models import Inbox, Message
+from src.domain.repositories import InboxRepository, InboxSort
+
+
+class DelegatingInboxRepository(InboxRepository):
+    """
+    Base for InboxRepository decorators: forwards every call to `inner`,
+    so subclasses only override the operations they change.
+    """
+
+    def __init__(self, inner: InboxRepository):
+        self.inner = inner
+
+    async def get_by_id(self, inbox_id: uuid.UUID) -> Optional[Inbox]:
+        return await self.inner.get_by_id(inbox_id)
+
+    async def get_version(self, inbox_id: uuid.UUID) -> Optional[int]:
+        return await self.inner.get_version(inbox_id)
+
+    async def save(self, inbox: Inbox) -> Inbox:
+        return await self.inner.save(inbox)
+
+    async def update_topic_if_unreplied(
+        self, inbox_id: uuid.UUID, owner_signature: str, topic: str
+    ) -> Optional[Inbox]:
+        return await self.inner.update_topic_if_unreplied(
+            inbox_id, owner_signature, topic
+        )
+
+    async def get_by_signature(
+        self,
+        signature: str,
+        limit: int = 1,
+        offset: int = 0,
+        sort: InboxSort = InboxSort.TOPIC,
+    ) -> List[Inbox]:
+        return await self.inner.get_by_signature(
+            signature, limit=limit, offset=offset, sort=sort
+        )
+
+    async def get_by_signature_after(
+        self,
+        signature: str,
+        sort: InboxSort,
+        sort_key: str | datetime,
+        inbox_id: uuid.UUID,
+        limit: int,
+    ) -> List[Inbox]:
+        return await self.inner.get_by_signature_after(
+            signature, sort=sort, sort_key=sort_key, inbox_id=inbox_id, limit=limit
+        )
+
+    async def get_messages_for_inbox(
+        self, inbox_id: uuid.UUID, limit: int, offset: int
+    ) -> List[Message]:
+        return await self.inner.get_messages_for_inbox(
+            inbox_id=inbox_id, limit=limit, offset=offset
+        )
+
+    async def get_messages_before(
+        self, inbox_id: uuid.UUID, created_at: datetime, message_id: int, limit: int
+    ) -> List[Message]:
+        return await self.inner.get_messages_before(
+            inbox_id=inbox_id, created_at=created_at, message_id=message_id, limit=limit
+        )
+
+    async def add_message(self, message: Message) -> Message:
+        return await self.inner.add_message(message)
+
+    async def add_message_if_accepted(self, message: Message) -> Optional[Message]:
+        return await self.inner.add_message_if_accepted(message)
+
+    async def add_messages(self, messages: List[Message]) -> List[Message]:
+        return await self.inner.add_messages(messages)
+
+    def stream_messages(
+        self, inbox_id: uuid.UUID, batch_size: int
+    ) -> AsyncIterator[Message]:
+        return self.inner.stream_messages(inbox_id, batch_size)
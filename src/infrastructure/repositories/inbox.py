@@ -1,10 +1,14 @@
 import uuid
-from typing import Optional
+from dataclasses import replace
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+from sqlalchemy import DateTime, String, case, insert, literal, tuple_, update
+from sqlalchemy.sql.dml import Update
 from sqlmodel import select
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.repositories import InboxRepository
+from src.domain.repositories import InboxRepository, InboxSort
 from src.domain.models import Inbox, Message
 from src.infrastructure.mappers.message_mapper import MessageMapper
 
@@ -13,6 +17,81 @@ from src.infrastructure.database.models import InboxDB, MessageDB
 from src.infrastructure.mappers.inbox_mapper import InboxMapper
 
 
+# reads select plain columns and map rows straight to domain objects: no ORM
+# instances, identity map entries or attribute instrumentation; ORM models
+# are only used on the write paths that need them (save, add_message)
+_INBOX_COLUMNS = tuple(InboxDB.__table__.columns)
+_MESSAGE_COLUMNS = tuple(MessageDB.__table__.columns)
+
+_INBOX_SORT_COLUMNS = {
+    InboxSort.TOPIC: (InboxDB.topic, True),
+    InboxSort.EXPIRES_AT: (InboxDB.expires_at, False),
+}
+
+
+def bump_message_counters(
+    inbox_id: uuid.UUID, added: int, last_message_at: datetime
+) -> Update:
+    """
+    UPDATE keeping InboxDB.message_count / last_message_at in step with
+    inserted messages, and bumping the version. Run it in the same
+    transaction as the INSERT.
+    """
+    return (
+        update(InboxDB)
+        .where(InboxDB.id == inbox_id)
+        .values(
+            message_count=InboxDB.message_count + added,
+            version=InboxDB.version + 1,
+            last_message_at=case(
+                (
+                    InboxDB.last_message_at.is_(None)
+                    | (InboxDB.last_message_at < last_message_at),
+                    last_message_at,
+                ),
+                else_=InboxDB.last_message_at,
+            ),
+        )
+    )
+
+
+async def insert_messages(session: AsyncSession, messages: List[Message]) -> List[int]:
+    """
+    Inserts messages with multi-row INSERTs and bumps the counters of every
+    inbox involved. Returns the new ids in input order; the caller commits.
+    """
+    rows = [
+        {
+            "inbox_id": message.inbox_id,
+            "body": message.body,
+            "created_at": message.created_at,
+            "signature": message.signature,
+        }
+        for message in messages
+    ]
+    if session.get_bind().dialect.name == "sqlite":
+        # SQLAlchemy cannot order a batched RETURNING on SQLite and would fall
+        # back to one INSERT per row. Writes are serialized there and rowids
+        # grow in VALUES order, so sorting the returned ids restores it.
+        statement = insert(MessageDB).returning(MessageDB.id)
+        result = await session.execute(statement, rows)
+        ids = sorted(result.scalars().all())
+    else:
+        statement = insert(MessageDB).returning(
+            MessageDB.id, sort_by_parameter_order=True
+        )
+        result = await session.execute(statement, rows)
+        ids = list(result.scalars().all())
+
+    per_inbox: Dict[uuid.UUID, tuple[int, datetime]] = {}
+    for message in messages:
+        added, latest = per_inbox.get(message.inbox_id, (0, message.created_at))
+        per_inbox[message.inbox_id] = (added + 1, max(latest, message.created_at))
+    for inbox_id, (added, latest) in per_inbox.items():
+        await session.execute(bump_message_counters(inbox_id, added, latest))
+    return ids
+
+
 class SqlAlchemyInboxRepository(InboxRepository):
     """
     SQLAlchemy implementation of the InboxRepository.
@@ -24,24 +103,67 @@ class SqlAlchemyInboxRepository(InboxRepository):
         self.message_mapper = MessageMapper()
 
     async def get_by_id(self, inbox_id: uuid.UUID) -> Optional[Inbox]:
-        statement = select(InboxDB).where(InboxDB.id == inbox_id)
+        statement = select(*_INBOX_COLUMNS).where(InboxDB.id == inbox_id)
         result = await self.session.execute(statement)
-        inbox_db = result.scalar_one_or_none()
-        return self.mapper.to_domain(inbox_db) if inbox_db else None
+        row = result.one_or_none()
+        return self.mapper.to_domain(row) if row else None
+
+    async def get_version(self, inbox_id: uuid.UUID) -> Optional[int]:
+        result = await self.session.execute(
+            select(InboxDB.version).where(InboxDB.id == inbox_id)
+        )
+        return result.scalar_one_or_none()
 
     async def get_messages_for_inbox(
         self, inbox_id: uuid.UUID, limit: int, offset: int
     ) -> List[Message]:
         statement = (
-            select(MessageDB)
+            select(*_MESSAGE_COLUMNS)
             .where(MessageDB.inbox_id == inbox_id)
-            .order_by(MessageDB.created_at.desc())
+            .order_by(MessageDB.created_at.desc(), MessageDB.id.desc())
             .offset(offset)
             .limit(limit)
         )
         result = await self.session.execute(statement)
-        rows = result.scalars().all()
-        return [self.message_mapper.to_domain(r) for r in rows]
+        return self.message_mapper.to_domain_many(result.all())
+
+    async def get_messages_before(
+        self, inbox_id: uuid.UUID, created_at: datetime, message_id: int, limit: int
+    ) -> List[Message]:
+        # row-value comparison lets the planner seek straight into
+        # ix_messages_inbox_created instead of skipping OFFSET rows; the
+        # redundant plain bound on created_at is what lets Postgres prune
+        # the monthly partitions newer than the cursor
+        statement = (
+            select(*_MESSAGE_COLUMNS)
+            .where(MessageDB.inbox_id == inbox_id)
+            .where(MessageDB.created_at <= created_at)
+            .where(
+                tuple_(MessageDB.created_at, MessageDB.id) < (created_at, message_id)
+            )
+            .order_by(MessageDB.created_at.desc(), MessageDB.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(statement)
+        return self.message_mapper.to_domain_many(result.all())
+
+    async def stream_messages(
+        self, inbox_id: uuid.UUID, batch_size: int
+    ) -> AsyncIterator[Message]:
+        # plain column rows on a server-side cursor: nothing lands in the
+        # identity map, so memory is bounded by batch_size, not the inbox
+        statement = (
+            select(*_MESSAGE_COLUMNS)
+            .where(MessageDB.inbox_id == inbox_id)
+            .order_by(MessageDB.created_at.asc(), MessageDB.id.asc())
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(statement)
+        try:
+            async for row in result:
+                yield self.message_mapper.to_domain(row)
+        finally:
+            await result.close()
 
     async def save(self, domain_inbox: Inbox) -> Inbox:
         db_inbox = self.mapper.to_db(domain_inbox)
@@ -50,22 +172,122 @@ class SqlAlchemyInboxRepository(InboxRepository):
         await self.session.commit()
         return self.mapper.to_domain(merged)
 
+    async def update_topic_if_unreplied(
+        self, inbox_id: uuid.UUID, owner_signature: str, topic: str
+    ) -> Optional[Inbox]:
+        # one UPDATE ... RETURNING replaces lookup + message probe + merge;
+        # replies bump message_count on this same row, so the row lock
+        # closes the race with a concurrent first reply
+        statement = (
+            update(InboxDB)
+            .where(
+                InboxDB.id == inbox_id,
+                InboxDB.owner_signature == owner_signature,
+                InboxDB.message_count == 0,
+            )
+            .values(topic=topic, version=InboxDB.version + 1)
+            .returning(*_INBOX_COLUMNS)
+        )
+        result = await self.session.execute(statement)
+        row = result.one_or_none()
+        await self.session.commit()
+        return self.mapper.to_domain(row) if row else None
+
     async def get_by_signature(
-        self, signature: str, limit: int = 1, offset: int = 0
+        self,
+        signature: str,
+        limit: int = 1,
+        offset: int = 0,
+        sort: InboxSort = InboxSort.TOPIC,
     ) -> List[Inbox]:
         statement = (
-            select(InboxDB)
+            select(*_INBOX_COLUMNS)
             .where(InboxDB.owner_signature == signature)
-            .order_by(InboxDB.topic.desc())
+            .order_by(*self._inbox_ordering(sort))
             .offset(offset)
             .limit(limit)
         )
         result = await self.session.execute(statement)
-        rows = result.scalars().all()
-        return [self.mapper.to_domain(r) for r in rows]
+        return self.mapper.to_domain_many(result.all())
+
+    async def get_by_signature_after(
+        self,
+        signature: str,
+        sort: InboxSort,
+        sort_key: str | datetime,
+        inbox_id: uuid.UUID,
+        limit: int,
+    ) -> List[Inbox]:
+        column, descending = _INBOX_SORT_COLUMNS[sort]
+        position = tuple_(column, InboxDB.id)
+        statement = (
+            select(*_INBOX_COLUMNS)
+            .where(InboxDB.owner_signature == signature)
+            .where(
+                position < (sort_key, inbox_id)
+                if descending
+                else position > (sort_key, inbox_id)
+            )
+            .order_by(*self._inbox_ordering(sort))
+            .limit(limit)
+        )
+        result = await self.session.execute(statement)
+        return self.mapper.to_domain_many(result.all())
+
+    @staticmethod
+    def _inbox_ordering(sort: InboxSort):
+        # every ordering is backed by an (owner_signature, <column>, id) index
+        column, descending = _INBOX_SORT_COLUMNS[sort]
+        if descending:
+            return column.desc(), InboxDB.id.desc()
+        return column.asc(), InboxDB.id.asc()
 
     async def add_message(self, message: Message) -> Message:
         db_message = self.message_mapper.to_db(message)
         self.session.add(db_message)
+        await self.session.execute(
+            bump_message_counters(message.inbox_id, 1, message.created_at)
+        )
         await self.session.commit()
         return self.message_mapper.to_domain(db_message)
+
+    async def add_message_if_accepted(self, message: Message) -> Optional[Message]:
+        # INSERT ... SELECT ... RETURNING: the inbox rules are evaluated by
+        # the same statement that writes, so there is no extra round trip and
+        # no window for the inbox to expire between check and insert
+        conditions = [
+            InboxDB.id == message.inbox_id,
+            InboxDB.expires_at > message.created_at,
+        ]
+        if message.signature is None:
+            conditions.append(InboxDB.allow_anonymous.is_(True))
+
+        source = select(
+            InboxDB.id,
+            literal(message.body, String),
+            literal(message.created_at, DateTime(timezone=True)),
+            literal(message.signature, String),
+        ).where(*conditions)
+        statement = (
+            insert(MessageDB)
+            .from_select(["inbox_id", "body", "created_at", "signature"], source)
+            .returning(MessageDB.id)
+        )
+        result = await self.session.execute(statement)
+        message_id = result.scalar_one_or_none()
+        if message_id is None:
+            await self.session.rollback()
+            return None
+
+        await self.session.execute(
+            bump_message_counters(message.inbox_id, 1, message.created_at)
+        )
+        await self.session.commit()
+        return replace(message, id=message_id)
+
+    async def add_messages(self, messages: List[Message]) -> List[Message]:
+        if not messages:
+            return []
+        ids = await insert_messages(self.session, messages)
+        await self.session.commit()
+        return [replace(m, id=message_id) for m, message_id in zip(messages, ids)]
@@ -1,16 +1,45 @@
 import uuid
-from fastapi import APIRouter, Depends, Response, Query, Header
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response, Query, Header
+from fastapi.responses import StreamingResponse
 
-from src.interface.dependencies import get_service
-from src.application.services.inbox import InboxService
+from src.config import settings
+from src.interface.dependencies import (
+    get_rate_limiter,
+    get_service,
+    metadata_response_cache,
+)
+from src.application.pagination import (
+    encode_inbox_cursor,
+    encode_message_cursor,
+    max_inbox_cursor_length,
+)
+from src.application.services.inbox import InboxService, ReplyDraft
+from src.domain.repositories import InboxSort
+from src.infrastructure.metrics import timed
+from src.interface.conditional import etag_matches, make_etag
+from src.infrastructure.rate_limit import RateLimiter
+from src.interface.exception_handlers import problem_for
+from src.interface.idempotency import IdempotentRequest, idempotency
+from src.interface.rate_limit import enforce_reply_limits
+from src.interface.responses import (
+    inboxes_page_json,
+    json_response,
+    messages_page_json,
+)
+from src.interface.export import ENCODERS, MEDIA_TYPES, ExportFormat
 from src.interface.schemas import (
     CreateInboxRequest,
     ReplyRequest,
+    BatchReplyRequest,
+    BatchReplyResponse,
+    BatchReplyResult,
     ChangeTopicRequest,
     CreatedInboxResponse,
     InboxesResponse,
     MessagesResponse,
     InboxPublicResponse,
+    TOPIC_MAX_LENGTH,
 )
 
 router = APIRouter(tags=["Inboxes"], prefix="/inboxes")
@@ -23,8 +52,12 @@ router = APIRouter(tags=["Inboxes"], prefix="/inboxes")
     summary="Create a new inbox and return its id and owner signature",
 )
 async def create_inbox(
-    req: CreateInboxRequest, service: InboxService = Depends(get_service)
+    req: CreateInboxRequest,
+    idempotent: Optional[IdempotentRequest] = Depends(idempotency),
+    service: InboxService = Depends(get_service),
 ):
+    if idempotent is not None and idempotent.stored is not None:
+        return idempotent.replay()
 
     inbox_id, signature = await service.create_inbox(
         topic=req.topic,
@@ -33,7 +66,16 @@ async def create_inbox(
         expires_at=req.expires_at,
         allow_anonymous=req.allow_anonymous,
     )
-    return CreatedInboxResponse(id=inbox_id, signature=signature)
+    response = Response(
+        content=CreatedInboxResponse(id=inbox_id, signature=signature)
+        .model_dump_json()
+        .encode(),
+        status_code=201,
+        media_type="application/json",
+    )
+    if idempotent is not None:
+        await idempotent.save(response)
+    return response
 
 
 @router.get(
@@ -43,10 +85,32 @@ async def create_inbox(
 )
 async def get_inbox_details(
     inbox_id: uuid.UUID,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     service: InboxService = Depends(get_service),
 ):
-    inbox = await service.get_inbox_metadata(inbox_id)
-    return inbox
+    # hits are served straight from bytes: no lookup, validation or encoding
+    entry = None
+    if settings.METADATA_RESPONSE_CACHE_ENABLED:
+        entry = metadata_response_cache.get(inbox_id)
+    if entry is None:
+        generation = metadata_response_cache.generation
+        inbox = await service.get_inbox_metadata(inbox_id)
+        with timed("serialization"):
+            body = InboxPublicResponse.model_validate(
+                inbox, from_attributes=True
+            ).model_dump_json()
+        entry = (make_etag(inbox.version), body.encode())
+        if settings.METADATA_RESPONSE_CACHE_ENABLED:
+            metadata_response_cache.set(inbox_id, entry, generation=generation)
+
+    etag, body = entry
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.METADATA_CACHE_CONTROL_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -58,11 +122,63 @@ async def get_inbox_details(
 async def reply_to_inbox(
     inbox_id: uuid.UUID,
     req: ReplyRequest,
+    request: Request,
+    idempotent: Optional[IdempotentRequest] = Depends(idempotency),
+    limiter: Optional[RateLimiter] = Depends(get_rate_limiter),
     service: InboxService = Depends(get_service),
 ):
+    # a replayed retry is neither throttled nor stored twice
+    if idempotent is not None and idempotent.stored is not None:
+        return idempotent.replay()
+
+    if limiter is not None:
+        await enforce_reply_limits(
+            limiter, request, inbox_id, [(req.username, req.secret)]
+        )
     await service.reply_to_inbox(
         inbox_id=inbox_id, body=req.body, username=req.username, secret=req.secret
     )
+    response = Response(status_code=201)
+    if idempotent is not None:
+        await idempotent.save(response)
+    return response
+
+
+@router.post(
+    "/{inbox_id}/messages/batch",
+    response_model=BatchReplyResponse,
+    status_code=200,
+    summary="Post several messages to an inbox in one transaction",
+)
+async def reply_to_inbox_batch(
+    inbox_id: uuid.UUID,
+    req: BatchReplyRequest,
+    request: Request,
+    limiter: Optional[RateLimiter] = Depends(get_rate_limiter),
+    service: InboxService = Depends(get_service),
+):
+    if limiter is not None:
+        await enforce_reply_limits(
+            limiter,
+            request,
+            inbox_id,
+            [(item.username, item.secret) for item in req.messages],
+        )
+    outcomes = await service.reply_to_inbox_batch(
+        inbox_id,
+        [
+            ReplyDraft(body=item.body, username=item.username, secret=item.secret)
+            for item in req.messages
+        ],
+    )
+    results = []
+    for outcome in outcomes:
+        if outcome.error is not None:
+            problem = problem_for(outcome.error, instance=str(request.url))
+            results.append(BatchReplyResult(status=problem.status, error=problem))
+        else:
+            results.append(BatchReplyResult(status=201, id=outcome.message.id))
+    return BatchReplyResponse(results=results)
 
 
 @router.patch(
@@ -78,12 +194,15 @@ async def change_topic(
     x_secret: str = Header(..., alias="X-secret"),
     service: InboxService = Depends(get_service),
 ):
-    await service.change_topic(
-        inbox_id=inbox_id,
-        new_topic=req.topic,
-        username=x_username,
-        secret=x_secret,
-    )
+    try:
+        await service.change_topic(
+            inbox_id=inbox_id,
+            new_topic=req.topic,
+            username=x_username,
+            secret=x_secret,
+        )
+    finally:
+        metadata_response_cache.invalidate(inbox_id)
 
 
 @router.get(
@@ -95,19 +214,64 @@ async def get_inbox_messages(
     inbox_id: uuid.UUID,
     x_username: str = Header(..., alias="X-username"),
     x_secret: str = Header(..., alias="X-secret"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None,
+        max_length=200,
+        description="Opaque `next_cursor` from a previous page; takes precedence over `page`",
+    ),
     service: InboxService = Depends(get_service),
 ):
-    messages = await service.get_messages(
+    result = await service.get_messages_page(
         inbox_id=inbox_id,
         username=x_username,
         secret=x_secret,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        is_current=lambda version: etag_matches(if_none_match, make_etag(version)),
     )
+    etag = make_etag(result.version)
+    if result.messages is None:
+        return Response(status_code=304, headers={"ETag": etag})
 
-    return MessagesResponse(messages=messages)
+    messages = result.messages
+
+    next_cursor = (
+        encode_message_cursor(messages[-1]) if len(messages) == page_size else None
+    )
+    return json_response(
+        messages_page_json(messages, next_cursor), headers={"ETag": etag}
+    )
+
+
+@router.get(
+    "/{inbox_id}/messages/export",
+    response_class=StreamingResponse,
+    summary="Stream every message of an inbox as NDJSON or CSV (owner-only)",
+)
+async def export_inbox_messages(
+    inbox_id: uuid.UUID,
+    x_username: str = Header(..., alias="X-username"),
+    x_secret: str = Header(..., alias="X-secret"),
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    service: InboxService = Depends(get_service),
+):
+    messages = await service.export_messages(
+        inbox_id=inbox_id,
+        username=x_username,
+        secret=x_secret,
+        batch_size=settings.EXPORT_BATCH_SIZE,
+    )
+    return StreamingResponse(
+        ENCODERS[export_format](messages),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{inbox_id}.{export_format.value}"'
+        },
+    )
 
 
 @router.get(
@@ -120,6 +284,12 @@ async def search_inboxes(
     x_secret: str = Header(..., alias="X-secret"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    sort: InboxSort = Query(InboxSort.TOPIC),
+    cursor: Optional[str] = Query(
+        None,
+        max_length=max_inbox_cursor_length(TOPIC_MAX_LENGTH),
+        description="Opaque `next_cursor` from a previous page; takes precedence over `page`",
+    ),
     service: InboxService = Depends(get_service),
 ):
     inboxes = await service.list_user_inboxes(
@@ -127,5 +297,10 @@ async def search_inboxes(
         secret=x_secret,
         page=page,
         page_size=page_size,
+        sort=sort,
+        cursor=cursor,
+    )
+    next_cursor = (
+        encode_inbox_cursor(inboxes[-1], sort) if len(inboxes) == page_size else None
     )
-    return InboxesResponse(inboxes=inboxes)
+    return json_response(inboxes_page_json(inboxes, next_cursor))
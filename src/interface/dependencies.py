@@ -1,20 +1,77 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncGenerator
+import uuid
+from typing import AsyncGenerator, Optional
+from src.config import settings
+from src.domain.models import Inbox
 from src.domain.repositories import InboxRepository
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.idempotency import IdempotencyStore, InMemoryIdempotencyStore
+from src.infrastructure.metrics import MetricsRegistry
+from src.infrastructure.rate_limit import InMemoryRateLimiter, RateLimiter
+from src.infrastructure.repositories.batching_inbox import BatchingInboxRepository
+from src.infrastructure.repositories.cached_inbox import CachingInboxRepository
 from src.infrastructure.repositories.inbox import SqlAlchemyInboxRepository
 from src.application.services.inbox import InboxService
 from src.infrastructure.database import get_session
 
+# process-wide, so it outlives the per-request repositories wrapping it
+inbox_cache: TTLCache[uuid.UUID, Inbox] = TTLCache(
+    max_size=settings.INBOX_CACHE_MAX_SIZE,
+    ttl_seconds=settings.INBOX_CACHE_TTL_SECONDS,
+)
+
+# ETag and JSON body of GET /inboxes/{inbox_id}, evicted on topic change
+metadata_response_cache: TTLCache[uuid.UUID, tuple[str, bytes]] = TTLCache(
+    max_size=settings.METADATA_RESPONSE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.METADATA_RESPONSE_CACHE_TTL_SECONDS,
+)
+
+# replaced by app.state.idempotency_store when IDEMPOTENCY_STORE=database
+idempotency_memory_store = InMemoryIdempotencyStore(
+    max_size=settings.IDEMPOTENCY_MAX_KEYS,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+)
+
+metrics_registry = MetricsRegistry()
+
+rate_limiter: RateLimiter = InMemoryRateLimiter(
+    shards=settings.RATE_LIMIT_SHARDS,
+    max_keys_per_shard=settings.RATE_LIMIT_MAX_KEYS_PER_SHARD,
+)
+
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async for session in get_session():
         yield session
 
 
-def get_repo(session: AsyncSession = Depends(get_db_session)) -> InboxRepository:
-    return SqlAlchemyInboxRepository(session)
+def get_repo(
+    request: Request, session: AsyncSession = Depends(get_db_session)
+) -> InboxRepository:
+    repo: InboxRepository = SqlAlchemyInboxRepository(session)
+
+    # only present when lifespan started it (MESSAGE_BATCHING_ENABLED)
+    message_writer = getattr(request.app.state, "message_writer", None)
+    if message_writer is not None:
+        repo = BatchingInboxRepository(repo, message_writer)
+
+    # outermost, so it also sees replies the batch writer flushes
+    if settings.INBOX_CACHE_ENABLED:
+        repo = CachingInboxRepository(repo, inbox_cache)
+    return repo
 
 
 def get_service(repo: InboxRepository = Depends(get_repo)) -> InboxService:
     return InboxService(repository=repo)
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    return rate_limiter if settings.RATE_LIMIT_ENABLED else None
+
+
+def get_idempotency_store(request: Request) -> Optional[IdempotencyStore]:
+    if not settings.IDEMPOTENCY_ENABLED:
+        return None
+    store = getattr(request.app.state, "idempotency_store", None)
+    return store if store is not None else idempotency_memory_store
@@ -1,3 +1,6 @@
+import math
+from typing import Optional
+
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
@@ -8,7 +11,10 @@ from src.domain.exceptions import (
     TopicChangeNotAllowedError,
     InvalidSignatureError,
     AnonymousMessagesNotAllowedError,
+    InvalidCursorError,
 )
+from src.interface.idempotency import IdempotencyConflictError
+from src.interface.rate_limit import RateLimitExceededError
 from src.interface.schemas import ProblemDetails
 
 EXCEPTION_MAPPING = {
@@ -20,18 +26,57 @@ EXCEPTION_MAPPING = {
         status.HTTP_403_FORBIDDEN,
         "Anonymity Forbidden",
     ),
+    InvalidCursorError: (status.HTTP_400_BAD_REQUEST, "Invalid Cursor"),
 }
 
 
-async def domain_exception_handler(request: Request, exc: DomainError):
+def problem_for(exc: DomainError, instance: Optional[str] = None) -> ProblemDetails:
     http_status, title = EXCEPTION_MAPPING.get(
         type(exc), (status.HTTP_400_BAD_REQUEST, "Business Rule Violation")
     )
+    return ProblemDetails(
+        title=title, status=http_status, detail=str(exc), instance=instance
+    )
+
+
+async def domain_exception_handler(request: Request, exc: DomainError):
+    problem = problem_for(exc, instance=str(request.url))
+    return JSONResponse(status_code=problem.status, content=problem.model_dump())
+
+
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceededError):
+    if math.isinf(exc.retry_after):
+        problem = ProblemDetails(
+            title="Batch Too Large",
+            status=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(exc),
+            instance=str(request.url),
+        )
+        return JSONResponse(status_code=problem.status, content=problem.model_dump())
+
+    problem = ProblemDetails(
+        title="Too Many Requests",
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(exc),
+        instance=str(request.url),
+    )
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content=problem.model_dump(),
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
 
+
+async def idempotency_exception_handler(
+    request: Request, exc: IdempotencyConflictError
+):
     problem = ProblemDetails(
-        title=title, status=http_status, detail=str(exc), instance=str(request.url)
+        title=exc.title,
+        status=exc.status_code,
+        detail=str(exc),
+        instance=str(request.url),
     )
-    return JSONResponse(status_code=http_status, content=problem.model_dump())
+    return JSONResponse(status_code=exc.status_code, content=problem.model_dump())
 
 
 async def unhandled_exception_handler(request: Request, exc: Exception):
@@ -0,0 +1,81 @@
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator
+
+from src.domain.models import Message
+from src.interface.schemas import MessageOverview
+
+# rows buffered into one chunk before it is handed to the ASGI server
+CHUNK_ROWS = 200
+
+CSV_COLUMNS = ("id", "created_at", "signature", "body")
+
+# leading characters spreadsheets evaluate as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def encode_ndjson(messages: AsyncIterator[Message]) -> AsyncIterator[bytes]:
+    chunk = bytearray()
+    rows = 0
+    async for message in messages:
+        chunk += MessageOverview.model_validate(message).model_dump_json().encode()
+        chunk += b"\n"
+        rows += 1
+        if rows == CHUNK_ROWS:
+            yield bytes(chunk)
+            chunk.clear()
+            rows = 0
+    if chunk:
+        yield bytes(chunk)
+
+
+def spreadsheet_safe(value: str) -> str:
+    """
+    Neutralizes CSV injection: bodies come from anonymous posters, so a
+    cell that a spreadsheet would run as a formula is prefixed with `'`.
+    """
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def encode_csv(messages: AsyncIterator[Message]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    rows = 0
+    async for message in messages:
+        writer.writerow(
+            (
+                message.id,
+                message.created_at.isoformat(),
+                spreadsheet_safe(message.signature or ""),
+                spreadsheet_safe(message.body),
+            )
+        )
+        rows += 1
+        if rows == CHUNK_ROWS:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+ENCODERS = {
+    ExportFormat.NDJSON: encode_ndjson,
+    ExportFormat.CSV: encode_csv,
+}
@@ -0,0 +1,93 @@
+import hashlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Set
+
+from fastapi import Depends, Header, Request, Response
+
+from src.infrastructure.idempotency import IdempotencyStore, StoredResponse
+from src.interface.dependencies import get_idempotency_store
+
+# keys whose first request is still running in this process
+_in_flight: Set[str] = set()
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when an Idempotency-Key cannot be honoured for this request."""
+
+    def __init__(self, status_code: int, title: str, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.title = title
+
+
+@dataclass(slots=True)
+class IdempotentRequest:
+    store: IdempotencyStore
+    key: str
+    fingerprint: str
+    # set when an earlier request with this key already completed
+    stored: Optional[StoredResponse] = None
+
+    def replay(self) -> Response:
+        return Response(
+            content=self.stored.body,
+            status_code=self.stored.status_code,
+            media_type=self.stored.media_type,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    async def save(self, response: Response) -> Response:
+        await self.store.put(
+            self.key,
+            StoredResponse(
+                fingerprint=self.fingerprint,
+                status_code=response.status_code,
+                body=bytes(response.body),
+                media_type=response.media_type,
+            ),
+        )
+        return response
+
+
+async def idempotency(
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=255
+    ),
+    store: Optional[IdempotencyStore] = Depends(get_idempotency_store),
+) -> AsyncIterator[Optional[IdempotentRequest]]:
+    """
+    Resolves the Idempotency-Key of a request: None without one, otherwise
+    the stored first response to replay (same key, path and body) or a
+    handle to store this one. Only successful responses are stored, so a
+    failed request can be retried with the same key.
+    """
+    if idempotency_key is None or store is None:
+        yield None
+        return
+
+    key = f"{request.method} {request.url.path} {idempotency_key}"
+    fingerprint = hashlib.sha256(await request.body()).hexdigest()
+
+    stored = await store.get(key)
+    if stored is not None:
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyConflictError(
+                422,
+                "Idempotency Key Reused",
+                "This Idempotency-Key was already used with a different body.",
+            )
+        yield IdempotentRequest(store, key, fingerprint, stored)
+        return
+
+    if key in _in_flight:
+        raise IdempotencyConflictError(
+            409,
+            "Request In Progress",
+            "A request with this Idempotency-Key is still being processed.",
+        )
+    _in_flight.add(key)
+    try:
+        yield IdempotentRequest(store, key, fingerprint)
+    finally:
+        _in_flight.discard(key)
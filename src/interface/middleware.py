@@ -0,0 +1,124 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.logging import request_id
+from src.infrastructure.metrics import MetricsRegistry, RequestTimings, request_timings
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentationMiddleware:
+    """
+    Pure ASGI middleware (no per-request task or body buffering) that
+    collects per-request timings and query counts, records them in a
+    MetricsRegistry labelled by route template, and warns about requests
+    issuing more than `query_warn_threshold` statements.
+    With `debug_headers`, the query count and DB time so far go out as
+    X-DB-Query-Count / X-DB-Time-Ms; a streamed body runs more queries
+    after the headers are sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        registry: Optional[MetricsRegistry] = None,
+        query_warn_threshold: Optional[int] = None,
+        debug_headers: bool = False,
+    ):
+        self.app = app
+        self.registry = registry
+        self.query_warn_threshold = query_warn_threshold
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        status = 500
+
+        async def send_instrumented(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.debug_headers:
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-db-query-count", str(timings.queries).encode()),
+                        (b"x-db-time-ms", f"{timings.db * 1000:.2f}".encode()),
+                    ]
+            await send(message)
+
+        token = request_timings.set(timings)
+        if self.registry is not None:
+            self.registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_instrumented)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_timings.reset(token)
+            # the router stores the matched route in the (shared) scope;
+            # using its template keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            if self.registry is not None:
+                self.registry.in_flight -= 1
+                self.registry.observe_request(
+                    scope["method"], route, status, elapsed, timings
+                )
+            if (
+                self.query_warn_threshold is not None
+                and timings.queries > self.query_warn_threshold
+            ):
+                logger.warning(
+                    "%s %s issued %d SQL statements (threshold %d)",
+                    scope["method"],
+                    route,
+                    timings.queries,
+                    self.query_warn_threshold,
+                )
+
+
+class RequestIdMiddleware:
+    """
+    Tags each HTTP request with an ID for the logs: the caller's X-Request-ID
+    when it is reasonably short, a fresh one otherwise. The ID is echoed
+    back in the response.
+    """
+
+    max_length = 128
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        value = None
+        for name, header in scope["headers"]:
+            if name == b"x-request-id":
+                value = header.decode("latin-1")
+                break
+        if not value or len(value) > self.max_length:
+            value = uuid.uuid4().hex
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", value.encode("latin-1")),
+                ]
+            await send(message)
+
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,84 @@
+import hashlib
+import math
+import uuid
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request
+
+from src.config import settings
+from src.infrastructure.rate_limit import BucketCharge, RateLimiter
+
+
+class RateLimitExceededError(Exception):
+    """
+    Raised before any service call when replies exceed a rate limit.
+    An infinite `retry_after` means the batch can never fit the bucket.
+    """
+
+    def __init__(self, scope: str, retry_after: float):
+        if math.isinf(retry_after):
+            detail = (
+                f"More messages than this {scope} may send at once; split the batch."
+            )
+        else:
+            detail = f"Too many messages for this {scope}; retry later."
+        super().__init__(detail)
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+def _signer_key(username: str, secret: str) -> bytes:
+    # one bucket per tripcode without paying for its (slow) derivation
+    # or keeping the secret in memory
+    return hashlib.blake2b(f"{username}\0{secret}".encode(), digest_size=16).digest()
+
+
+async def enforce_reply_limits(
+    limiter: RateLimiter,
+    request: Request,
+    inbox_id: uuid.UUID,
+    signers: Iterable[Tuple[Optional[str], Optional[str]]],
+) -> None:
+    """
+    Charges one token per reply to the client address, the inbox and each
+    signer (username/secret pair), all or nothing, and raises
+    RateLimitExceededError when any bucket is short.
+    """
+    signers = list(signers)
+    count = len(signers)
+    client = request.client.host if request.client else "unknown"
+
+    charges = [
+        BucketCharge(
+            ("client", client),
+            settings.RATE_LIMIT_CLIENT_PER_MINUTE / 60,
+            settings.RATE_LIMIT_CLIENT_BURST,
+            count,
+        ),
+        BucketCharge(
+            ("inbox", inbox_id),
+            settings.RATE_LIMIT_INBOX_PER_MINUTE / 60,
+            settings.RATE_LIMIT_INBOX_BURST,
+            count,
+        ),
+    ]
+    per_signer = Counter(
+        _signer_key(username, secret)
+        for username, secret in signers
+        if username is not None and secret is not None
+    )
+    for key, replies in per_signer.items():
+        charges.append(
+            BucketCharge(
+                ("signer", key),
+                settings.RATE_LIMIT_SIGNER_PER_MINUTE / 60,
+                settings.RATE_LIMIT_SIGNER_BURST,
+                replies,
+            )
+        )
+
+    rejected = await limiter.acquire(charges)
+    if rejected is not None:
+        charge, retry_after = rejected
+        raise RateLimitExceededError(charge.key[0], retry_after)
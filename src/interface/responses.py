@@ -0,0 +1,54 @@
+import dataclasses
+from typing import Dict, List, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+from src.domain.models import Inbox, Message
+from src.infrastructure.metrics import timed
+from src.interface.schemas import InboxOverview, MessageOverview
+
+
+class MessagesPage(TypedDict):
+    messages: List[Message]
+    next_cursor: Optional[str]
+
+
+class InboxesPage(TypedDict):
+    inboxes: List[Inbox]
+    next_cursor: Optional[str]
+
+
+def _hidden_fields(entity: type, schema: Type[BaseModel]) -> set[str]:
+    # derived from the public schema so the two cannot drift apart
+    return {f.name for f in dataclasses.fields(entity)} - set(schema.model_fields)
+
+
+# pydantic-core walks the domain dataclasses and writes JSON in one pass,
+# instead of validating into response models, validating again against
+# response_model and running jsonable_encoder + json.dumps
+_MESSAGES_PAGE = TypeAdapter(MessagesPage)
+_MESSAGES_EXCLUDE = {"messages": {"__all__": _hidden_fields(Message, MessageOverview)}}
+_INBOXES_PAGE = TypeAdapter(InboxesPage)
+_INBOXES_EXCLUDE = {"inboxes": {"__all__": _hidden_fields(Inbox, InboxOverview)}}
+
+
+def messages_page_json(messages: List[Message], next_cursor: Optional[str]) -> bytes:
+    with timed("serialization"):
+        return _MESSAGES_PAGE.dump_json(
+            {"messages": messages, "next_cursor": next_cursor},
+            exclude=_MESSAGES_EXCLUDE,
+        )
+
+
+def inboxes_page_json(inboxes: List[Inbox], next_cursor: Optional[str]) -> bytes:
+    with timed("serialization"):
+        return _INBOXES_PAGE.dump_json(
+            {"inboxes": inboxes, "next_cursor": next_cursor},
+            exclude=_INBOXES_EXCLUDE,
+        )
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -3,9 +3,18 @@ from datetime import datetime
 from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field, FutureDatetime, ConfigDict, model_validator
 
+from src.config import settings
+
+
+TOPIC_MAX_LENGTH = 100
 
 TopicType = Annotated[
-    str, Field(min_length=5, max_length=100, description="Subject of the discussion")
+    str,
+    Field(
+        min_length=5,
+        max_length=TOPIC_MAX_LENGTH,
+        description="Subject of the discussion",
+    ),
 ]
 UsernameType = Annotated[
     str, Field(min_length=3, max_length=50, pattern=r"^[a-zA-Z0-9_-]+$")
@@ -56,6 +65,15 @@ class ReplyRequest(BaseSchema):
         return self
 
 
+class BatchReplyRequest(BaseSchema):
+    messages: List[ReplyRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.REPLY_BATCH_MAX_ITEMS,
+        description="Replies to append; each is accepted or rejected on its own",
+    )
+
+
 class ChangeTopicRequest(BaseSchema):
     topic: TopicType
 
@@ -65,12 +83,18 @@ class InboxOverview(BaseModel):
     topic: str
     expires_at: datetime
     allow_anonymous: bool
+    message_count: int
+    last_message_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class InboxesResponse(BaseModel):
     inboxes: List[InboxOverview]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `cursor` (with the same `sort`) to fetch the following page",
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -96,6 +120,18 @@ class ProblemDetails(BaseModel):
     instance: Optional[str] = None
 
 
+class BatchReplyResult(BaseModel):
+    status: int = Field(..., description="HTTP status this reply would have had alone")
+    id: Optional[int] = None
+    error: Optional[ProblemDetails] = None
+
+
+class BatchReplyResponse(BaseModel):
+    results: List[BatchReplyResult] = Field(
+        ..., description="One entry per submitted reply, in request order"
+    )
+
+
 class MessageOverview(BaseModel):
     id: int
     body: str
@@ -107,5 +143,8 @@ class MessageOverview(BaseModel):
 
 class MessagesResponse(BaseModel):
     messages: List[MessageOverview]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the following page"
+    )
 
     model_config = ConfigDict(from_attributes=True)
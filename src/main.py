@@ -1,25 +1,165 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
 from fastapi import FastAPI
 
+from src.application.utils import tripcode_engine
 from src.config import settings
-from src.interface.api import inboxes
+from src.interface.api import inboxes, metrics
+from src.interface.dependencies import (
+    inbox_cache,
+    metadata_response_cache,
+    metrics_registry,
+)
 from src.interface.exception_handlers import (
     DomainError,
     domain_exception_handler,
+    idempotency_exception_handler,
+    rate_limit_exception_handler,
     unhandled_exception_handler,
 )
+from src.interface.idempotency import IdempotencyConflictError
+from src.interface.middleware import InstrumentationMiddleware, RequestIdMiddleware
+from src.interface.rate_limit import RateLimitExceededError
+from src.infrastructure.cache import log_stats_periodically
+from src.infrastructure.database.partitions import (
+    maintain_message_partitions_periodically,
+)
+from src.infrastructure.database.session import (
+    dispose_engine,
+    get_session_factory,
+    init_engine,
+    warm_up_pool,
+)
+from src.infrastructure.idempotency import (
+    SqlIdempotencyStore,
+    purge_expired_periodically,
+)
+from src.infrastructure.ingestion import MessageBatchWriter
 from src.infrastructure.logging import setup_logging
+from src.infrastructure.reaper import ExpiredInboxReaper
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    setup_logging()
-    yield
+    log_listener = setup_logging(
+        json_format=settings.LOG_FORMAT == "json",
+        rate_limits=settings.LOG_RATE_LIMITS,
+    )
+
+    engine = init_engine()
+    await warm_up_pool(settings.DB_POOL_WARMUP)
+
+    partition_task = None
+    if engine.dialect.name == "postgresql":
+        # also a no-op until the partitioning migration has run
+        partition_task = asyncio.create_task(
+            maintain_message_partitions_periodically(
+                engine,
+                months_ahead=settings.MESSAGE_PARTITIONS_AHEAD_MONTHS,
+                retain_months=settings.MESSAGE_RETENTION_MONTHS,
+                interval_seconds=settings.MESSAGE_PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+            )
+        )
+
+    message_writer = None
+    if settings.MESSAGE_BATCHING_ENABLED:
+        message_writer = MessageBatchWriter(
+            session_factory=get_session_factory(),
+            max_batch_size=settings.MESSAGE_BATCH_MAX_SIZE,
+            max_delay_ms=settings.MESSAGE_BATCH_MAX_DELAY_MS,
+        )
+        message_writer.start()
+    app.state.message_writer = message_writer
+
+    reaper = None
+    if settings.REAPER_ENABLED:
+        reaper = ExpiredInboxReaper(
+            session_factory=get_session_factory(),
+            grace_period=timedelta(seconds=settings.REAPER_GRACE_PERIOD_SECONDS),
+            interval_seconds=settings.REAPER_INTERVAL_SECONDS,
+            batch_size=settings.REAPER_BATCH_SIZE,
+            max_inboxes_per_second=settings.REAPER_MAX_INBOXES_PER_SECOND,
+            message_batch_size=settings.REAPER_MESSAGE_BATCH_SIZE,
+        )
+        reaper.start()
+        metrics_registry.collectors["reaper"] = reaper.collect_metrics
+    app.state.reaper = reaper
+
+    idempotency_store = None
+    idempotency_purge_task = None
+    if settings.IDEMPOTENCY_ENABLED and settings.IDEMPOTENCY_STORE == "database":
+        idempotency_store = SqlIdempotencyStore(
+            session_factory=get_session_factory(),
+            ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+        )
+        idempotency_purge_task = asyncio.create_task(
+            purge_expired_periodically(
+                idempotency_store, settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS
+            )
+        )
+    app.state.idempotency_store = idempotency_store
+
+    cache_stats_tasks = []
+    if settings.INBOX_CACHE_STATS_LOG_INTERVAL_SECONDS > 0:
+        for name, enabled, cache in (
+            ("inbox", settings.INBOX_CACHE_ENABLED, inbox_cache),
+            (
+                "metadata_response",
+                settings.METADATA_RESPONSE_CACHE_ENABLED,
+                metadata_response_cache,
+            ),
+        ):
+            if enabled:
+                cache_stats_tasks.append(
+                    asyncio.create_task(
+                        log_stats_periodically(
+                            name,
+                            cache,
+                            settings.INBOX_CACHE_STATS_LOG_INTERVAL_SECONDS,
+                        )
+                    )
+                )
+
+    try:
+        yield
+    finally:
+        for task in (partition_task, idempotency_purge_task):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        for cache_stats_task in cache_stats_tasks:
+            cache_stats_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await cache_stats_task
+        if reaper is not None:
+            metrics_registry.collectors.pop("reaper", None)
+            await reaper.close()
+        if message_writer is not None:
+            # flush whatever replies are still buffered before exiting
+            await message_writer.close()
+        tripcode_engine.shutdown()
+        await dispose_engine()
+        log_listener.stop()
 
 
 app = FastAPI(title="Fuss-Free Feedback API", version="1.0.0", lifespan=lifespan)
 
 app.include_router(inboxes.router, prefix=f"/api/{settings.API_VERSION}")
 
+app.add_middleware(
+    InstrumentationMiddleware,
+    registry=metrics_registry if settings.METRICS_ENABLED else None,
+    query_warn_threshold=settings.REQUEST_QUERY_WARN_THRESHOLD,
+    debug_headers=settings.DEBUG_QUERY_HEADERS,
+)
+# outermost, so everything logged while handling a request carries its ID
+app.add_middleware(RequestIdMiddleware)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+
 app.add_exception_handler(DomainError, domain_exception_handler)
+app.add_exception_handler(RateLimitExceededError, rate_limit_exception_handler)
+app.add_exception_handler(IdempotencyConflictError, idempotency_exception_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
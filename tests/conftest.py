@@ -7,7 +7,13 @@ import httpx
 from fastapi.routing import APIRoute
 
 from src.main import app
-from src.interface.dependencies import get_db_session
+from src.infrastructure.idempotency import InMemoryIdempotencyStore
+from src.infrastructure.rate_limit import InMemoryRateLimiter
+from src.interface.dependencies import (
+    get_db_session,
+    get_idempotency_store,
+    get_rate_limiter,
+)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -60,6 +66,11 @@ async def client(session):
         yield session
 
     app.dependency_overrides[get_db_session] = override_get_db_session
+    # fresh buckets per test; every test client shares one address
+    limiter = InMemoryRateLimiter()
+    app.dependency_overrides[get_rate_limiter] = lambda: limiter
+    idempotency_store = InMemoryIdempotencyStore(max_size=1000, ttl_seconds=60)
+    app.dependency_overrides[get_idempotency_store] = lambda: idempotency_store
 
     transport = ASGITransport(app=app)
     async with httpx.AsyncClient(
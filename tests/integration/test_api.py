@@ -1,8 +1,17 @@
+import csv
+import io
+import json
+import uuid
 import pytest
 from httpx import AsyncClient
+from sqlmodel import update
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
+from src.config import settings
+from src.application.services.inbox import InboxService
+from src.infrastructure.database.models import InboxDB
+
 
 TEST_TOPIC = "Product Feedback Topic"
 TEST_USERNAME = "alice_tester"
@@ -129,6 +138,98 @@ async def test_post_message_and_fetch_with_auth(
     assert "created_at" in msg
 
 
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_all_messages(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages"
+    for i in range(5):
+        resp = await client.post(url, json={"body": f"message {i}"})
+        assert resp.status_code == 201
+
+    bodies = []
+    params = {"page_size": 2}
+    while True:
+        resp = await client.get(url, headers=auth_headers, params=params)
+        assert resp.status_code == 200
+        data = resp.json()
+        bodies.extend(m["body"] for m in data["messages"])
+        if not data["next_cursor"]:
+            break
+        params = {"page_size": 2, "cursor": data["next_cursor"]}
+
+    assert bodies == [f"message {i}" for i in reversed(range(5))]
+
+
+@pytest.mark.asyncio
+async def test_messages_invalid_cursor_returns_400(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+
+    resp = await client.get(
+        f"{api_prefix}/inboxes/{inbox_id}/messages",
+        headers=auth_headers,
+        params={"cursor": "garbage!"},
+    )
+
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["topic", "expires_at"])
+async def test_owner_listing_cursor_walks_all_inboxes(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers, sort
+):
+    created = set()
+    for i in range(5):
+        _, inbox_id = await create_inbox(
+            # duplicate topics exercise the id tie-breaker of the keyset
+            _get_valid_payload_copy_with(topic=f"Listing topic {i % 2}")
+        )
+        created.add(inbox_id)
+
+    seen = []
+    params = {"page_size": 2, "sort": sort}
+    while True:
+        resp = await client.get(
+            f"{api_prefix}/inboxes/", headers=auth_headers, params=params
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        seen.extend(i["id"] for i in data["inboxes"])
+        if not data["next_cursor"]:
+            break
+        params = {"page_size": 2, "sort": sort, "cursor": data["next_cursor"]}
+
+    assert len(seen) == len(created)
+    assert set(seen) == created
+
+
+@pytest.mark.asyncio
+async def test_owner_listing_cursor_accepts_long_non_ascii_topic(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    for _ in range(2):
+        await create_inbox(_get_valid_payload_copy_with(topic="\U0001f600" * 100))
+
+    resp = await client.get(
+        f"{api_prefix}/inboxes/", headers=auth_headers, params={"page_size": 1}
+    )
+    next_cursor = resp.json()["next_cursor"]
+    assert next_cursor
+
+    resp = await client.get(
+        f"{api_prefix}/inboxes/",
+        headers=auth_headers,
+        params={"page_size": 1, "cursor": next_cursor},
+    )
+
+    assert resp.status_code == 200
+    assert len(resp.json()["inboxes"]) == 1
+
+
 @pytest.mark.asyncio
 async def test_create_inbox_invalid_payload(client: AsyncClient, api_prefix: str):
     """Validation: missing fields should return 422."""
@@ -159,3 +260,359 @@ def _get_valid_payload_copy_with(**kwargs):
     }
     payload.update(kwargs)
     return payload
+
+
+@pytest.mark.asyncio
+async def test_reply_to_missing_inbox_returns_404(client: AsyncClient, api_prefix: str):
+    resp = await client.post(
+        f"{api_prefix}/inboxes/00000000-0000-0000-0000-000000000000/messages",
+        json={"body": "hello?"},
+    )
+
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_anonymous_reply_rejected_when_not_allowed(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox(
+        _get_valid_payload_copy_with(allow_anonymous=False)
+    )
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages"
+
+    anonymous = await client.post(url, json={"body": "who am I"})
+    signed = await client.post(
+        url,
+        json={"body": "it's me", "username": "bob_signer", "secret": "bob_secret_1"},
+    )
+
+    assert anonymous.status_code == 403
+    assert anonymous.json()["title"] == "Anonymity Forbidden"
+    assert signed.status_code == 201
+    read = await client.get(url, headers=auth_headers)
+    assert [m["body"] for m in read.json()["messages"]] == ["it's me"]
+
+
+@pytest.mark.asyncio
+async def test_reply_to_expired_inbox_returns_403(
+    client: AsyncClient, api_prefix: str, create_inbox, session
+):
+    _, inbox_id = await create_inbox()
+    await session.execute(
+        update(InboxDB)
+        .where(InboxDB.id == uuid.UUID(inbox_id))
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+    )
+    await session.commit()
+
+    resp = await client.post(
+        f"{api_prefix}/inboxes/{inbox_id}/messages", json={"body": "too late"}
+    )
+
+    assert resp.status_code == 403
+    assert resp.json()["title"] == "Inbox Expired"
+
+
+@pytest.mark.asyncio
+async def test_change_topic_until_first_reply(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}"
+
+    changed = await client.patch(
+        url, json={"topic": "Renamed topic"}, headers=auth_headers
+    )
+    wrong_owner = await client.patch(
+        url,
+        json={"topic": "Hijacked topic"},
+        headers={"X-Username": "mallory", "X-Secret": "not_the_secret"},
+    )
+    await client.post(f"{url}/messages", json={"body": "first!"})
+    too_late = await client.patch(
+        url, json={"topic": "Another topic"}, headers=auth_headers
+    )
+    missing = await client.patch(
+        f"{api_prefix}/inboxes/00000000-0000-0000-0000-000000000000",
+        json={"topic": "Nobody home"},
+        headers=auth_headers,
+    )
+
+    assert changed.status_code == 204
+    assert wrong_owner.status_code == 403
+    assert too_late.status_code == 409
+    assert missing.status_code == 404
+    assert (await client.get(url)).json()["topic"] == "Renamed topic"
+
+
+@pytest.mark.asyncio
+async def test_owner_listing_reports_message_counts(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    for body in ("one", "two"):
+        await client.post(
+            f"{api_prefix}/inboxes/{inbox_id}/messages", json={"body": body}
+        )
+
+    resp = await client.get(f"{api_prefix}/inboxes/", headers=auth_headers)
+
+    (overview,) = resp.json()["inboxes"]
+    assert overview["message_count"] == 2
+    assert overview["last_message_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_batch_reply_reports_each_item(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox(
+        _get_valid_payload_copy_with(allow_anonymous=False)
+    )
+    signer = {"username": "bob_signer", "secret": "bob_secret_1"}
+
+    resp = await client.post(
+        f"{api_prefix}/inboxes/{inbox_id}/messages/batch",
+        json={
+            "messages": [
+                {"body": "first", **signer},
+                {"body": "who am I"},
+                {"body": "second", **signer},
+            ]
+        },
+    )
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == [201, 403, 201]
+    assert results[1]["error"]["title"] == "Anonymity Forbidden"
+    assert results[0]["id"] is not None and results[2]["id"] is not None
+    read = await client.get(
+        f"{api_prefix}/inboxes/{inbox_id}/messages", headers=auth_headers
+    )
+    assert sorted(m["body"] for m in read.json()["messages"]) == ["first", "second"]
+    listing = await client.get(f"{api_prefix}/inboxes/", headers=auth_headers)
+    assert listing.json()["inboxes"][0]["message_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_reply_to_missing_inbox_returns_404(
+    client: AsyncClient, api_prefix: str
+):
+    resp = await client.post(
+        f"{api_prefix}/inboxes/00000000-0000-0000-0000-000000000000/messages/batch",
+        json={"messages": [{"body": "hello?"}]},
+    )
+
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_streams_all_messages_as_ndjson_and_csv(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    bodies = [f"message {i}" for i in range(5)] + ['quoted, "comma"\nline']
+    await client.post(
+        f"{api_prefix}/inboxes/{inbox_id}/messages/batch",
+        json={"messages": [{"body": body} for body in bodies]},
+    )
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages/export"
+
+    ndjson = await client.get(url, headers=auth_headers)
+    csv_resp = await client.get(url, params={"format": "csv"}, headers=auth_headers)
+    forbidden = await client.get(
+        url, headers={"X-Username": "mallory", "X-Secret": "not_the_secret"}
+    )
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [line["body"] for line in lines] == bodies
+    assert csv_resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(csv_resp.text)))
+    assert [row["body"] for row in rows] == bodies
+    assert forbidden.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_304_until_inbox_changes(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    details_url = f"{api_prefix}/inboxes/{inbox_id}"
+    messages_url = f"{details_url}/messages"
+
+    details = await client.get(details_url)
+    page = await client.get(messages_url, headers=auth_headers)
+    details_etag, page_etag = details.headers["ETag"], page.headers["ETag"]
+    unchanged_details = await client.get(
+        details_url, headers={"If-None-Match": details_etag}
+    )
+    unchanged_page = await client.get(
+        messages_url, headers={**auth_headers, "If-None-Match": f"W/{page_etag}"}
+    )
+    await client.post(messages_url, json={"body": "news"})
+    changed_page = await client.get(
+        messages_url, headers={**auth_headers, "If-None-Match": page_etag}
+    )
+
+    assert unchanged_details.status_code == 304
+    assert unchanged_details.content == b""
+    assert unchanged_page.status_code == 304
+    assert changed_page.status_code == 200
+    assert changed_page.headers["ETag"] != page_etag
+    assert [m["body"] for m in changed_page.json()["messages"]] == ["news"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_of_messages_still_requires_owner(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages"
+    etag = (await client.get(url, headers=auth_headers)).headers["ETag"]
+
+    resp = await client.get(
+        url,
+        headers={
+            "X-Username": "mallory",
+            "X-Secret": "not_the_secret",
+            "If-None-Match": etag,
+        },
+    )
+
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_public_metadata_is_served_from_response_cache(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers, monkeypatch
+):
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}"
+    first = await client.get(url)
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("metadata should come from the response cache")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(InboxService, "get_inbox_metadata", fail)
+        cached = await client.get(url)
+    await client.patch(url, json={"topic": "Renamed topic"}, headers=auth_headers)
+    renamed = await client.get(url)
+
+    assert cached.status_code == 200
+    assert cached.content == first.content
+    assert cached.headers["Cache-Control"].startswith("public, max-age=")
+    assert renamed.json()["topic"] == "Renamed topic"
+    assert renamed.headers["ETag"] != first.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_requests_by_route_template(
+    client: AsyncClient, api_prefix: str, create_inbox
+):
+    _, inbox_id = await create_inbox()
+    await client.get(f"{api_prefix}/inboxes/{inbox_id}")
+
+    resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    route = f"{api_prefix}/inboxes/{{inbox_id}}"
+    assert f'method="GET",route="{route}",status="200"' in resp.text
+    assert str(inbox_id) not in resp.text
+    assert (
+        f'http_request_phase_seconds_count{{method="GET",route="{route}",'
+        'phase="service"}' in resp.text
+    )
+
+
+@pytest.mark.asyncio
+async def test_replies_beyond_rate_limit_get_429_without_reaching_service(
+    client: AsyncClient, api_prefix: str, create_inbox, monkeypatch
+):
+    monkeypatch.setattr(settings, "RATE_LIMIT_SIGNER_BURST", 2)
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages"
+    signed = {"body": "hi", "username": "spammer", "secret": "spam_secret"}
+
+    accepted = [await client.post(url, json=signed) for _ in range(2)]
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("throttled replies must not reach the service")
+
+    monkeypatch.setattr(InboxService, "reply_to_inbox", fail)
+    throttled = await client.post(url, json=signed)
+
+    assert [r.status_code for r in accepted] == [201, 201]
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) >= 1
+    assert throttled.json()["title"] == "Too Many Requests"
+
+
+@pytest.mark.asyncio
+async def test_create_inbox_retry_with_idempotency_key_replays_first_response(
+    client: AsyncClient, api_prefix: str, valid_payload, monkeypatch
+):
+    url = f"{api_prefix}/inboxes/"
+    headers = {"Idempotency-Key": "create-1"}
+    first = await client.post(url, json=valid_payload, headers=headers)
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("a replayed request must not create another inbox")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(InboxService, "create_inbox", fail)
+        retry = await client.post(url, json=valid_payload, headers=headers)
+    other_body = await client.post(
+        url, json={**valid_payload, "topic": "Another topic"}, headers=headers
+    )
+    other_key = await client.post(
+        url, json=valid_payload, headers={"Idempotency-Key": "create-2"}
+    )
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert other_body.status_code == 422
+    assert other_body.json()["title"] == "Idempotency Key Reused"
+    assert other_key.json()["id"] != first.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_reply_retry_with_idempotency_key_stores_one_message(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers
+):
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages"
+    headers = {"Idempotency-Key": "reply-1"}
+
+    replies = [
+        await client.post(url, json={"body": "only once"}, headers=headers)
+        for _ in range(3)
+    ]
+    messages = (await client.get(url, headers=auth_headers)).json()["messages"]
+
+    assert [r.status_code for r in replies] == [201, 201, 201]
+    assert [m["body"] for m in messages] == ["only once"]
+
+
+@pytest.mark.asyncio
+async def test_batch_larger_than_client_burst_is_rejected_whole(
+    client: AsyncClient, api_prefix: str, create_inbox, auth_headers, monkeypatch
+):
+    monkeypatch.setattr(settings, "RATE_LIMIT_CLIENT_BURST", 3)
+    _, inbox_id = await create_inbox()
+    url = f"{api_prefix}/inboxes/{inbox_id}/messages"
+
+    resp = await client.post(
+        f"{url}/batch", json={"messages": [{"body": f"m{i}"} for i in range(4)]}
+    )
+    messages = (await client.get(url, headers=auth_headers)).json()["messages"]
+
+    assert resp.status_code == 413
+    assert "Retry-After" not in resp.headers
+    assert messages == []
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+
+from src.infrastructure.database.models import InboxDB, MessageDB
+from src.infrastructure.reaper import ExpiredInboxReaper
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+async def _add_inbox(session_factory, expires_in: timedelta, messages: int) -> InboxDB:
+    now = datetime.now(timezone.utc)
+    inbox = InboxDB(
+        topic="Reaper Topic",
+        owner_signature="sig",
+        expires_at=now + expires_in,
+        allow_anonymous=True,
+    )
+    async with session_factory() as session:
+        session.add(inbox)
+        await session.flush()
+        for i in range(messages):
+            session.add(MessageDB(inbox_id=inbox.id, body=f"m{i}", created_at=now))
+        await session.commit()
+    return inbox
+
+
+async def _remaining_inbox_ids(session_factory) -> set:
+    async with session_factory() as session:
+        return set((await session.execute(select(InboxDB.id))).scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_reaper_purges_only_inboxes_past_grace_period(session_factory):
+    long_expired = [
+        await _add_inbox(session_factory, -timedelta(days=10), messages=2)
+        for _ in range(5)
+    ]
+    recently_expired = await _add_inbox(session_factory, -timedelta(hours=1), 1)
+    live = await _add_inbox(session_factory, timedelta(days=1), 1)
+    reaper = ExpiredInboxReaper(
+        session_factory,
+        grace_period=timedelta(days=1),
+        batch_size=2,
+        max_inboxes_per_second=10_000,
+    )
+
+    deleted = await reaper.run_once()
+
+    assert deleted == len(long_expired)
+    assert await _remaining_inbox_ids(session_factory) == {
+        recently_expired.id,
+        live.id,
+    }
+    async with session_factory() as session:
+        count = await session.execute(select(func.count()).select_from(MessageDB))
+        assert count.scalar_one() == 2
+    assert reaper.stats()["inboxes_deleted"] == 5
+    assert reaper.stats()["messages_deleted"] == 10
+    assert reaper.stats()["passes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reaper_background_task_stops_on_close(session_factory):
+    await _add_inbox(session_factory, -timedelta(days=10), messages=1)
+    reaper = ExpiredInboxReaper(
+        session_factory, grace_period=timedelta(0), interval_seconds=60
+    )
+
+    reaper.start()
+    for _ in range(100):
+        if reaper.stats()["passes"]:
+            break
+        await asyncio.sleep(0.01)
+    await reaper.close()
+
+    assert reaper.stats()["inboxes_deleted"] == 1
+    assert await _remaining_inbox_ids(session_factory) == set()
+
+
+@pytest.mark.asyncio
+async def test_reaper_deletes_messages_in_row_bounded_chunks(session_factory):
+    await _add_inbox(session_factory, -timedelta(days=10), messages=7)
+    reaper = ExpiredInboxReaper(
+        session_factory,
+        grace_period=timedelta(days=1),
+        message_batch_size=3,
+        max_inboxes_per_second=10_000,
+    )
+    chunks = []
+    purge_messages = reaper._purge_messages
+
+    async def record(inbox_ids):
+        deleted = await purge_messages(inbox_ids)
+        chunks.append(deleted)
+        return deleted
+
+    reaper._purge_messages = record
+
+    assert await reaper.run_once() == 1
+    assert chunks == [3, 3, 1]
+    assert reaper.stats()["messages_deleted"] == 7
+    assert await _remaining_inbox_ids(session_factory) == set()
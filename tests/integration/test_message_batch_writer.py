@@ -0,0 +1,149 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+
+from src.domain.models import Message
+from src.infrastructure.database.models import InboxDB, MessageDB
+from src.infrastructure.ingestion import MessageBatchWriter
+from src.infrastructure.repositories.inbox import insert_messages
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def inbox_id(session_factory):
+    inbox = InboxDB(
+        topic="Batching Topic",
+        owner_signature="sig",
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        allow_anonymous=True,
+    )
+    async with session_factory() as session:
+        session.add(inbox)
+        await session.commit()
+    return inbox.id
+
+
+def _message(inbox_id: uuid.UUID, body: str) -> Message:
+    return Message(inbox_id=inbox_id, body=body, created_at=datetime.now(timezone.utc))
+
+
+async def _count_messages(session_factory) -> int:
+    async with session_factory() as session:
+        result = await session.execute(select(func.count()).select_from(MessageDB))
+        return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_submitters_get_committed_messages_with_ids(session_factory, inbox_id):
+    writer = MessageBatchWriter(session_factory, max_batch_size=3, max_delay_ms=5)
+    writer.start()
+
+    saved = await asyncio.gather(
+        *(writer.submit(_message(inbox_id, f"body {i}")) for i in range(7))
+    )
+    await writer.close()
+
+    assert [m.body for m in saved] == [f"body {i}" for i in range(7)]
+    assert len({m.id for m in saved}) == 7
+    assert await _count_messages(session_factory) == 7
+    async with session_factory() as session:
+        inbox = await session.get(InboxDB, inbox_id)
+    assert inbox.message_count == 7
+    assert inbox.last_message_at is not None
+
+
+@pytest.mark.asyncio
+async def test_close_drains_buffered_messages(session_factory, inbox_id):
+    writer = MessageBatchWriter(
+        session_factory, max_batch_size=100, max_delay_ms=10_000
+    )
+    writer.start()
+
+    pending = [
+        asyncio.create_task(writer.submit(_message(inbox_id, "late"))) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    await writer.close()
+
+    assert all(task.done() for task in pending)
+    assert await _count_messages(session_factory) == 5
+
+
+@pytest.mark.asyncio
+async def test_submit_after_close_is_rejected(session_factory, inbox_id):
+    writer = MessageBatchWriter(session_factory)
+    writer.start()
+    await writer.close()
+
+    with pytest.raises(RuntimeError):
+        await writer.submit(_message(inbox_id, "too late"))
+
+
+@pytest.mark.asyncio
+async def test_failing_row_does_not_fail_rest_of_batch(session_factory, inbox_id):
+    writer = MessageBatchWriter(session_factory, max_batch_size=3, max_delay_ms=50)
+    writer.start()
+
+    results = await asyncio.gather(
+        writer.submit(_message(inbox_id, "ok 1")),
+        writer.submit(_message(inbox_id, None)),
+        writer.submit(_message(inbox_id, "ok 2")),
+        return_exceptions=True,
+    )
+    await writer.close()
+
+    assert [r.body for r in (results[0], results[2])] == ["ok 1", "ok 2"]
+    assert isinstance(results[1], Exception)
+    assert await _count_messages(session_factory) == 2
+
+
+@pytest.mark.asyncio
+async def test_insert_messages_is_one_statement_with_ids_in_input_order(
+    session_factory, inbox_id
+):
+    bodies = [f"reply {i}" for i in range(25)]
+    inserts = []
+
+    async with session_factory() as session:
+        engine = session.get_bind()
+
+        def count_inserts(conn, cursor, statement, *args):
+            if statement.startswith("INSERT INTO messages"):
+                inserts.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_inserts)
+        try:
+            ids = await insert_messages(
+                session, [_message(inbox_id, body) for body in bodies]
+            )
+            await session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", count_inserts)
+
+        stored = await session.execute(select(MessageDB.id, MessageDB.body))
+        by_id = dict(stored.all())
+
+    assert len(inserts) == 1
+    assert [by_id[message_id] for message_id in ids] == bodies
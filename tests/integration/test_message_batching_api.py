@@ -0,0 +1,75 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src import main
+from src.config import settings
+from src.infrastructure.repositories.batching_inbox import BatchingInboxRepository
+from src.infrastructure.repositories.cached_inbox import CachingInboxRepository
+from src.interface.dependencies import get_repo
+
+
+@pytest.mark.asyncio
+async def test_replies_go_through_batch_writer_and_are_drained_on_shutdown(
+    client: AsyncClient, api_prefix: str, session, monkeypatch
+):
+    monkeypatch.setattr(settings, "MESSAGE_BATCHING_ENABLED", True)
+    monkeypatch.setattr(settings, "MESSAGE_BATCH_MAX_DELAY_MS", 1.0)
+    test_session_factory = sessionmaker(
+        bind=session.bind, class_=AsyncSession, expire_on_commit=False
+    )
+    monkeypatch.setattr(main, "get_session_factory", lambda: test_session_factory)
+    monkeypatch.setattr(main.app.state, "message_writer", None, raising=False)
+    headers = {"X-Username": "batch_owner", "X-Secret": "batch_secret_1"}
+
+    async with main.lifespan(main.app):
+        writer = main.app.state.message_writer
+        assert writer is not None
+
+        create = await client.post(
+            f"{api_prefix}/inboxes/",
+            json={
+                "topic": "Batched replies",
+                "username": "batch_owner",
+                "secret": "batch_secret_1",
+                "allow_anonymous": True,
+                "expires_at": (
+                    datetime.now(timezone.utc) + timedelta(days=1)
+                ).isoformat(),
+            },
+        )
+        inbox_id = create.json()["id"]
+
+        for i in range(3):
+            resp = await client.post(
+                f"{api_prefix}/inboxes/{inbox_id}/messages", json={"body": f"b{i}"}
+            )
+            assert resp.status_code == 201
+
+    assert main.app.state.message_writer is writer
+    assert writer._task is None
+
+    resp = await client.get(
+        f"{api_prefix}/inboxes/{inbox_id}/messages", headers=headers
+    )
+    assert [m["body"] for m in resp.json()["messages"]] == ["b2", "b1", "b0"]
+
+
+def test_get_repo_wraps_batching_repository_when_writer_running(session):
+    class _State:
+        message_writer = object()
+
+    class _App:
+        state = _State()
+
+    class _Request:
+        app = _App()
+
+    repo = get_repo(_Request(), session)
+
+    # the cache wraps the batching layer so flushed replies evict entries
+    if isinstance(repo, CachingInboxRepository):
+        repo = repo.inner
+    assert isinstance(repo, BatchingInboxRepository)
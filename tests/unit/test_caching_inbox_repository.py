@@ -0,0 +1,117 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta, timezone
+
+from src.domain.models import Inbox, Message
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.repositories.cached_inbox import CachingInboxRepository
+
+INBOX_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def inbox():
+    return Inbox(
+        id=INBOX_ID,
+        topic="Cached Topic",
+        owner_signature="sig",
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        allow_anonymous=True,
+    )
+
+
+@pytest.fixture
+def inner(inbox):
+    repo = AsyncMock()
+    repo.get_by_id.return_value = inbox
+    repo.save.side_effect = lambda i: i
+    return repo
+
+
+@pytest.fixture
+def repo(inner):
+    return CachingInboxRepository(inner, TTLCache(max_size=10, ttl_seconds=60))
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_hits_inner_repository_once(repo, inner):
+    first = await repo.get_by_id(INBOX_ID)
+    second = await repo.get_by_id(INBOX_ID)
+
+    assert first == second
+    inner.get_by_id.assert_awaited_once_with(INBOX_ID)
+    assert repo.cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_inbox_is_isolated_from_caller_mutation(repo):
+    await repo.get_by_id(INBOX_ID)
+    cached = await repo.get_by_id(INBOX_ID)
+
+    cached.topic = "Mutated Topic"
+
+    assert (await repo.get_by_id(INBOX_ID)).topic == "Cached Topic"
+
+
+@pytest.mark.asyncio
+async def test_cached_inbox_children_are_not_shared(repo, inbox):
+    inbox.messages = [
+        Message(inbox_id=INBOX_ID, body="original", created_at=inbox.expires_at)
+    ]
+    await repo.get_by_id(INBOX_ID)
+    cached = await repo.get_by_id(INBOX_ID)
+
+    cached.messages.append("extra")
+    cached.messages[0].body = "mutated"
+
+    fresh = await repo.get_by_id(INBOX_ID)
+    assert len(fresh.messages) == 1
+    assert fresh.messages[0].body == "original"
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_cached_entry(repo, inner, inbox):
+    await repo.get_by_id(INBOX_ID)
+
+    await repo.save(inbox)
+    await repo.get_by_id(INBOX_ID)
+
+    assert inner.get_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_inbox_is_not_cached(repo, inner):
+    inner.get_by_id.return_value = None
+
+    assert await repo.get_by_id(INBOX_ID) is None
+    assert await repo.get_by_id(INBOX_ID) is None
+    assert inner.get_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_topic_update_invalidates_cached_entry(repo, inner, inbox):
+    await repo.get_by_id(INBOX_ID)
+
+    await repo.update_topic_if_unreplied(INBOX_ID, "sig", "Fresh Topic")
+    await repo.get_by_id(INBOX_ID)
+
+    assert inner.get_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "add",
+    [
+        lambda repo, m: repo.add_message(m),
+        lambda repo, m: repo.add_message_if_accepted(m),
+        lambda repo, m: repo.add_messages([m, m]),
+    ],
+)
+async def test_replies_invalidate_cached_entry(repo, inner, inbox, add):
+    await repo.get_by_id(INBOX_ID)
+
+    await add(repo, Message(inbox_id=INBOX_ID, body="hi", created_at=inbox.expires_at))
+    await repo.get_by_id(INBOX_ID)
+
+    assert inner.get_by_id.await_count == 2
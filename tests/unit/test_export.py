@@ -0,0 +1,46 @@
+import csv
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from src.domain.models import Message
+from src.interface.export import encode_csv
+
+
+async def _messages(*bodies):
+    for i, body in enumerate(bodies, start=1):
+        yield Message(
+            id=i,
+            inbox_id=None,
+            body=body,
+            created_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        '=HYPERLINK("http://evil.example","x")',
+        "=cmd|' /C calc'!A0",
+        "+1+1",
+        "-2+3",
+        "@SUM(A1)",
+        "\tindented",
+        "\rreturn",
+    ],
+)
+async def test_csv_cells_that_would_run_as_formulas_are_quoted(body):
+    chunks = [chunk async for chunk in encode_csv(_messages(body))]
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+
+    assert rows[0]["body"] == "'" + body
+
+
+@pytest.mark.asyncio
+async def test_plain_csv_cells_are_left_alone():
+    chunks = [chunk async for chunk in encode_csv(_messages("thanks = great", "a-b"))]
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+
+    assert [row["body"] for row in rows] == ["thanks = great", "a-b"]
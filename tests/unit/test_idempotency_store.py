@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+
+from src.infrastructure.database.models import IdempotencyKeyDB
+from src.infrastructure.idempotency import (
+    InMemoryIdempotencyStore,
+    SqlIdempotencyStore,
+    StoredResponse,
+)
+
+FIRST = StoredResponse(fingerprint="a", status_code=201, body=b"{}", media_type=None)
+SECOND = StoredResponse(fingerprint="b", status_code=201, body=b"[]")
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sql_store_keeps_the_first_response_until_it_expires(session_factory):
+    store = SqlIdempotencyStore(session_factory, ttl_seconds=60)
+
+    await store.put("POST /inboxes/ k", FIRST)
+    await store.put("POST /inboxes/ k", SECOND)
+    kept = await store.get("POST /inboxes/ k")
+
+    async with session_factory() as session:
+        await session.execute(
+            update(IdempotencyKeyDB).values(
+                expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+            )
+        )
+        await session.commit()
+    expired = await store.get("POST /inboxes/ k")
+    purged = await store.purge_expired()
+
+    assert kept == FIRST
+    assert expired is None
+    assert purged == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_store_keeps_the_first_response():
+    store = InMemoryIdempotencyStore(max_size=10, ttl_seconds=60)
+
+    await store.put("k", FIRST)
+    await store.put("k", SECOND)
+
+    assert await store.get("k") == FIRST
+    assert await store.get("other") is None
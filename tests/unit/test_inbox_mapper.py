@@ -75,3 +75,22 @@ def test_to_db_maps_fields_correctly(mapper):
     assert db_entity.owner_signature == "owner-sig"
     assert db_entity.expires_at == expires_at
     assert db_entity.allow_anonymous is True
+
+
+def test_to_domain_maps_message_counters(mapper):
+    db_entity = InboxDB(
+        id=uuid.uuid4(),
+        topic="Counter Topic",
+        owner_signature="sig",
+        expires_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        allow_anonymous=True,
+        message_count=4,
+        last_message_at=datetime(2029, 6, 1, 8, 0, 0),
+    )
+
+    domain_entity = mapper.to_domain(db_entity)
+
+    assert domain_entity.message_count == 4
+    assert domain_entity.last_message_at == datetime(
+        2029, 6, 1, 8, 0, 0, tzinfo=timezone.utc
+    )
@@ -98,3 +98,29 @@ def test_validate_new_message_fails_anonymous_not_allowed(strict_inbox):
 
 def test_validate_new_message_success_strict_signed(strict_inbox):
     strict_inbox.validate_new_message(signature="some_sig")
+
+
+def test_change_topic_uses_message_counter_by_default(valid_inbox):
+    valid_inbox.message_count = 3
+
+    assert valid_inbox.has_messages is True
+    with pytest.raises(TopicChangeNotAllowedError):
+        valid_inbox.change_topic("New Topic")
+
+
+def test_change_topic_allowed_without_messages_by_default(valid_inbox):
+    valid_inbox.change_topic("New Topic")
+    assert valid_inbox.topic == "New Topic"
+
+
+def test_messages_are_not_loaded_by_default():
+    inbox = Inbox(
+        id=uuid.uuid4(),
+        topic="Lazy Topic",
+        owner_signature="owner123",
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        allow_anonymous=True,
+    )
+
+    assert inbox.messages is None
+    assert not hasattr(inbox, "__dict__")
@@ -1,15 +1,21 @@
 import pytest
 import uuid
+from dataclasses import replace
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone, timedelta
 
-from src.application.services.inbox import InboxService
+from src.application.pagination import encode_inbox_cursor, encode_message_cursor
+from src.application.services.inbox import InboxService, ReplyDraft
 from src.domain.exceptions import (
     NotFoundError,
     InboxExpiredError,
     InvalidSignatureError,
+    InvalidCursorError,
+    AnonymousMessagesNotAllowedError,
+    TopicChangeNotAllowedError,
 )
 from src.domain.models import Inbox, Message
+from src.domain.repositories import InboxSort
 
 INBOX_ID = uuid.uuid4()
 USERNAME = "alice"
@@ -66,7 +72,7 @@ async def test_create_inbox_success(service, mock_repo):
 
 @pytest.mark.asyncio
 async def test_reply_to_inbox_success(service, mock_repo, mock_inbox_entity):
-    mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_repo.add_message_if_accepted.side_effect = lambda message: message
 
     with patch(
         "src.application.services.inbox.generate_tripcode",
@@ -74,12 +80,11 @@ async def test_reply_to_inbox_success(service, mock_repo, mock_inbox_entity):
     ):
         await service.reply_to_inbox(INBOX_ID, "Hello Body", USERNAME, SECRET)
 
-    mock_repo.get_by_id.assert_called_with(INBOX_ID)
-
-    mock_inbox_entity.validate_new_message.assert_called_with(MOCKED_SIGNATURE)
+    # the happy path is a single conditional insert, no inbox lookup
+    mock_repo.get_by_id.assert_not_called()
 
-    mock_repo.add_message.assert_called_once()
-    args, kwargs = mock_repo.add_message.call_args
+    mock_repo.add_message_if_accepted.assert_called_once()
+    args, kwargs = mock_repo.add_message_if_accepted.call_args
     message_arg = args[0]
 
     assert isinstance(message_arg, Message)
@@ -90,26 +95,51 @@ async def test_reply_to_inbox_success(service, mock_repo, mock_inbox_entity):
 
 @pytest.mark.asyncio
 async def test_reply_to_inbox_not_found(service, mock_repo):
+    mock_repo.add_message_if_accepted.return_value = None
     mock_repo.get_by_id.return_value = None
-    with pytest.raises(NotFoundError):
-        await service.reply_to_inbox(INBOX_ID, "Body", USERNAME, SECRET)
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        new=AsyncMock(return_value=MOCKED_SIGNATURE),
+    ) as tripcode:
+        with pytest.raises(NotFoundError):
+            await service.reply_to_inbox(INBOX_ID, "Body", USERNAME, SECRET)
+    tripcode.assert_awaited_once_with(USERNAME, SECRET)
+    attempted = mock_repo.add_message_if_accepted.await_args.args[0]
+    assert attempted.signature == MOCKED_SIGNATURE
     mock_repo.add_message.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_reply_to_inbox_validation_fails(service, mock_repo, mock_inbox_entity):
+    mock_repo.add_message_if_accepted.return_value = None
     mock_repo.get_by_id.return_value = mock_inbox_entity
     mock_inbox_entity.validate_new_message.side_effect = InboxExpiredError("Expired")
-    with pytest.raises(InboxExpiredError):
-        await service.reply_to_inbox(INBOX_ID, "Body", USERNAME, SECRET)
-    mock_repo.add_message.assert_not_called()
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        with pytest.raises(InboxExpiredError):
+            await service.reply_to_inbox(INBOX_ID, "Body", USERNAME, SECRET)
+    mock_inbox_entity.validate_new_message.assert_called_with(MOCKED_SIGNATURE)
 
 
 @pytest.mark.asyncio
-async def test_change_topic_success(service, mock_repo, mock_inbox_entity):
+async def test_reply_to_inbox_anonymous_rejection_is_reported(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_repo.add_message_if_accepted.return_value = None
     mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_inbox_entity.validate_new_message.side_effect = (
+        AnonymousMessagesNotAllowedError("No anonymous")
+    )
+    with pytest.raises(AnonymousMessagesNotAllowedError):
+        await service.reply_to_inbox(INBOX_ID, "Body", None, None)
+    mock_inbox_entity.validate_new_message.assert_called_with(None)
 
-    mock_repo.get_messages_for_inbox.return_value = []
+
+@pytest.mark.asyncio
+async def test_change_topic_success(service, mock_repo, mock_inbox_entity):
+    mock_repo.update_topic_if_unreplied.return_value = mock_inbox_entity
 
     with patch(
         "src.application.services.inbox.generate_tripcode",
@@ -119,29 +149,50 @@ async def test_change_topic_success(service, mock_repo, mock_inbox_entity):
             INBOX_ID, "Brand New Topic", USERNAME, SECRET
         )
 
-    mock_inbox_entity.validate_ownership.assert_called_with(MOCKED_SIGNATURE)
-
-    mock_repo.get_messages_for_inbox.assert_called_with(
-        inbox_id=INBOX_ID, limit=1, offset=0
+    mock_repo.update_topic_if_unreplied.assert_called_with(
+        INBOX_ID, MOCKED_SIGNATURE, "Brand New Topic"
     )
+    mock_repo.get_by_id.assert_not_called()
+    mock_repo.save.assert_not_called()
+    assert result == mock_inbox_entity
 
-    mock_inbox_entity.change_topic.assert_called_with(
-        "Brand New Topic", has_messages=False
-    )
 
-    mock_repo.save.assert_called_with(mock_inbox_entity)
-    assert result == mock_inbox_entity
+@pytest.mark.asyncio
+async def test_change_topic_not_found(service, mock_repo):
+    mock_repo.update_topic_if_unreplied.return_value = None
+    mock_repo.get_by_id.return_value = None
+    with pytest.raises(NotFoundError):
+        await service.change_topic(INBOX_ID, "New Topic", USERNAME, SECRET)
 
 
 @pytest.mark.asyncio
 async def test_change_topic_unauthorized(service, mock_repo, mock_inbox_entity):
+    mock_repo.update_topic_if_unreplied.return_value = None
     mock_repo.get_by_id.return_value = mock_inbox_entity
     mock_inbox_entity.validate_ownership.side_effect = InvalidSignatureError(
         "Bad signature"
     )
     with pytest.raises(InvalidSignatureError):
         await service.change_topic(INBOX_ID, "New Topic", "hacker", "wrong")
-    mock_repo.save.assert_not_called()
+    mock_inbox_entity.change_topic.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_change_topic_rejected_when_inbox_has_replies(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_repo.update_topic_if_unreplied.return_value = None
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_inbox_entity.change_topic.side_effect = TopicChangeNotAllowedError(
+        "Has replies"
+    )
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        with pytest.raises(TopicChangeNotAllowedError):
+            await service.change_topic(INBOX_ID, "New Topic", USERNAME, SECRET)
+    mock_inbox_entity.validate_ownership.assert_called_with(MOCKED_SIGNATURE)
 
 
 @pytest.mark.asyncio
@@ -179,10 +230,45 @@ async def test_list_user_inboxes(service, mock_repo):
         return_value=MOCKED_SIGNATURE,
     ):
         result = await service.list_user_inboxes(USERNAME, SECRET, page=1, page_size=50)
-    mock_repo.get_by_signature.assert_called_with(MOCKED_SIGNATURE, limit=50, offset=0)
+    mock_repo.get_by_signature.assert_called_with(
+        MOCKED_SIGNATURE, limit=50, offset=0, sort=InboxSort.TOPIC
+    )
     assert result == expected_inboxes
 
 
+@pytest.mark.asyncio
+async def test_list_user_inboxes_with_cursor_uses_keyset(service, mock_repo):
+    expires_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    last_seen = Inbox(
+        id=INBOX_ID,
+        topic="Some Topic",
+        owner_signature=MOCKED_SIGNATURE,
+        expires_at=expires_at,
+        allow_anonymous=True,
+    )
+    cursor = encode_inbox_cursor(last_seen, InboxSort.EXPIRES_AT)
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        await service.list_user_inboxes(
+            USERNAME,
+            SECRET,
+            page=1,
+            page_size=5,
+            sort=InboxSort.EXPIRES_AT,
+            cursor=cursor,
+        )
+    mock_repo.get_by_signature_after.assert_called_with(
+        MOCKED_SIGNATURE,
+        sort=InboxSort.EXPIRES_AT,
+        sort_key=expires_at,
+        inbox_id=INBOX_ID,
+        limit=5,
+    )
+    mock_repo.get_by_signature.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_inbox_metadata_success(service, mock_repo, mock_inbox_entity):
     mock_repo.get_by_id.return_value = mock_inbox_entity
@@ -195,3 +281,160 @@ async def test_get_inbox_metadata_not_found(service, mock_repo):
     mock_repo.get_by_id.return_value = None
     with pytest.raises(NotFoundError):
         await service.get_inbox_metadata(INBOX_ID)
+
+
+@pytest.mark.asyncio
+async def test_get_messages_with_cursor_uses_keyset(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    created_at = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+    cursor = encode_message_cursor(
+        Message(inbox_id=INBOX_ID, body="x", created_at=created_at, id=42)
+    )
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        await service.get_messages(
+            INBOX_ID, USERNAME, SECRET, page=1, page_size=10, cursor=cursor
+        )
+    mock_repo.get_messages_before.assert_called_with(
+        inbox_id=INBOX_ID, created_at=created_at, message_id=42, limit=10
+    )
+    mock_repo.get_messages_for_inbox.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_messages_rejects_malformed_cursor(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        with pytest.raises(InvalidCursorError):
+            await service.get_messages(
+                INBOX_ID, USERNAME, SECRET, page=1, page_size=10, cursor="garbage!"
+            )
+
+
+@pytest.mark.asyncio
+async def test_reply_to_inbox_batch_derives_each_signer_once(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_inbox_entity.is_expired = False
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_repo.add_messages.side_effect = lambda messages: [
+        replace(m, id=i) for i, m in enumerate(messages, start=1)
+    ]
+    drafts = [
+        ReplyDraft(body="one", username=USERNAME, secret=SECRET),
+        ReplyDraft(body="two", username=USERNAME, secret=SECRET),
+        ReplyDraft(body="three"),
+    ]
+
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ) as tripcode:
+        outcomes = await service.reply_to_inbox_batch(INBOX_ID, drafts)
+
+    tripcode.assert_awaited_once_with(USERNAME, SECRET)
+    mock_repo.get_by_id.assert_awaited_once_with(INBOX_ID)
+    mock_repo.add_messages.assert_awaited_once()
+    assert [o.message.id for o in outcomes] == [1, 2, 3]
+    assert [o.message.signature for o in outcomes] == [
+        MOCKED_SIGNATURE,
+        MOCKED_SIGNATURE,
+        None,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reply_to_inbox_batch_reports_rejected_drafts(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_inbox_entity.is_expired = False
+
+    def validate_new_message(signature):
+        if signature is None:
+            raise AnonymousMessagesNotAllowedError("no")
+
+    mock_inbox_entity.validate_new_message.side_effect = validate_new_message
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_repo.add_messages.side_effect = lambda messages: messages
+
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        outcomes = await service.reply_to_inbox_batch(
+            INBOX_ID,
+            [
+                ReplyDraft(body="anon"),
+                ReplyDraft(body="signed", username=USERNAME, secret=SECRET),
+            ],
+        )
+
+    assert isinstance(outcomes[0].error, AnonymousMessagesNotAllowedError)
+    assert outcomes[0].message is None
+    assert outcomes[1].message.body == "signed"
+    (accepted,), _ = mock_repo.add_messages.call_args
+    assert [m.body for m in accepted] == ["signed"]
+
+
+@pytest.mark.asyncio
+async def test_reply_to_inbox_batch_expired_inbox(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_inbox_entity.is_expired = True
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+
+    with pytest.raises(InboxExpiredError):
+        await service.reply_to_inbox_batch(INBOX_ID, [ReplyDraft(body="late")])
+    mock_repo.add_messages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_messages_page_checks_owner_before_reading_version(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_inbox_entity.validate_ownership.side_effect = InvalidSignatureError(
+        "ACCESS_DENIED"
+    )
+
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ):
+        with pytest.raises(InvalidSignatureError):
+            await service.get_messages_page(INBOX_ID, USERNAME, SECRET, 1, 20)
+    mock_repo.get_version.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_messages_page_skips_the_page_when_caller_is_current(
+    service, mock_repo, mock_inbox_entity
+):
+    mock_repo.get_by_id.return_value = mock_inbox_entity
+    mock_repo.get_version.return_value = 7
+
+    with patch(
+        "src.application.services.inbox.generate_tripcode",
+        return_value=MOCKED_SIGNATURE,
+    ) as tripcode:
+        current = await service.get_messages_page(
+            INBOX_ID, USERNAME, SECRET, 1, 20, is_current=lambda v: v == 7
+        )
+        stale = await service.get_messages_page(
+            INBOX_ID, USERNAME, SECRET, 1, 20, is_current=lambda v: v == 6
+        )
+
+    assert current.version == 7 and current.messages is None
+    assert stale.messages == mock_repo.get_messages_for_inbox.return_value
+    assert mock_repo.get_by_id.await_count == 2
+    assert tripcode.await_count == 2
+    mock_repo.get_messages_for_inbox.assert_awaited_once()
@@ -0,0 +1,126 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.infrastructure.database.instrumentation import (
+    instrument_engine,
+    normalize_sql,
+)
+from src.infrastructure.metrics import MetricsRegistry
+from src.interface.middleware import InstrumentationMiddleware
+
+
+def test_normalize_sql_collapses_literals_placeholders_and_in_lists():
+    statement = """
+        SELECT messages.id FROM messages
+        WHERE messages.inbox_id IN (?, ?, ?) AND body = 'it''s' LIMIT 20
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT messages.id FROM messages "
+        "WHERE messages.inbox_id IN (?) AND body = ? LIMIT ?"
+    )
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "SELECT * FROM inboxes WHERE id = $1",
+        "SELECT * FROM inboxes WHERE id = %(id_1)s",
+        "SELECT * FROM inboxes WHERE id = :id_1",
+    ],
+)
+def test_normalize_sql_handles_every_paramstyle(statement):
+    assert normalize_sql(statement) == "SELECT * FROM inboxes WHERE id = ?"
+
+
+@pytest.fixture
+async def instrumented_app():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+
+    inner = FastAPI()
+
+    @inner.get("/work", response_class=PlainTextResponse)
+    async def work(queries: int, failing: int = 0):
+        async with engine.connect() as conn:
+            for _ in range(queries):
+                await conn.execute(text("SELECT 1"))
+            for _ in range(failing):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing"))
+        return "ok"
+
+    registry = MetricsRegistry()
+    app = InstrumentationMiddleware(
+        inner,
+        registry=registry,
+        query_warn_threshold=3,
+        debug_headers=True,
+    )
+    yield app, registry
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_query_count_goes_to_headers_metrics_and_n_plus_one_warning(
+    instrumented_app, caplog
+):
+    app, registry = instrumented_app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        with caplog.at_level(logging.WARNING, logger="src.interface.middleware"):
+            few = await client.get("/work", params={"queries": 2})
+            many = await client.get("/work", params={"queries": 4})
+
+    assert few.headers["X-DB-Query-Count"] == "2"
+    assert many.headers["X-DB-Query-Count"] == "4"
+    assert float(many.headers["X-DB-Time-Ms"]) > 0
+    assert registry.queries[("GET", "/work")] == 6
+    warnings = [r.getMessage() for r in caplog.records]
+    assert warnings == ["GET /work issued 4 SQL statements (threshold 3)"]
+
+
+@pytest.mark.asyncio
+async def test_statements_over_threshold_are_logged_normalized(
+    instrumented_app, caplog, monkeypatch
+):
+    app, _ = instrumented_app
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        with caplog.at_level(
+            logging.WARNING, logger="src.infrastructure.database.instrumentation"
+        ):
+            await client.get("/work", params={"queries": 1})
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().endswith(": SELECT ?")
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_are_counted_and_logged(
+    instrumented_app, caplog, monkeypatch
+):
+    app, _ = instrumented_app
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        with caplog.at_level(
+            logging.WARNING, logger="src.infrastructure.database.instrumentation"
+        ):
+            failing = await client.get("/work", params={"queries": 0, "failing": 2})
+        after = await client.get("/work", params={"queries": 1})
+
+    assert failing.headers["X-DB-Query-Count"] == "2"
+    assert after.headers["X-DB-Query-Count"] == "1"
+    failed = [r for r in caplog.records if "(failed)" in r.getMessage()]
+    assert len(failed) == 2
+    assert failed[0].getMessage().endswith(": SELECT * FROM missing")
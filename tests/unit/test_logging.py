@@ -0,0 +1,69 @@
+import json
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.infrastructure.logging import (
+    JsonFormatter,
+    RateLimitFilter,
+    RequestIdFilter,
+    request_id,
+)
+from src.interface.middleware import RequestIdMiddleware
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord("src.test", level, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_drops_info_beyond_budget_but_never_warnings(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("src.infrastructure.logging.time.monotonic", lambda: clock[0])
+    limiter = RateLimitFilter(per_second=2)
+
+    passed = [limiter.filter(make_record()) for _ in range(4)]
+    warning_passed = limiter.filter(make_record(level=logging.WARNING))
+    clock[0] += 1
+    record = make_record()
+
+    assert passed == [True, True, False, False]
+    assert warning_passed
+    assert limiter.filter(record)
+    assert record.getMessage() == "hello world [2 similar dropped]"
+
+
+def test_json_formatter_includes_request_id():
+    record = make_record()
+    token = request_id.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "hello world"
+    assert entry["logger"] == "src.test"
+    assert entry["request_id"] == "req-1"
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_propagated_or_generated_and_echoed():
+    inner = FastAPI()
+
+    @inner.get("/")
+    async def current():
+        return {"request_id": request_id.get()}
+
+    transport = httpx.ASGITransport(app=RequestIdMiddleware(inner))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        given = await client.get("/", headers={"X-Request-ID": "abc-123"})
+        generated = await client.get("/")
+        too_long = await client.get("/", headers={"X-Request-ID": "x" * 500})
+
+    assert given.json()["request_id"] == "abc-123"
+    assert given.headers["X-Request-ID"] == "abc-123"
+    assert generated.json()["request_id"] == generated.headers["X-Request-ID"]
+    assert len(too_long.headers["X-Request-ID"]) == 32
@@ -1,5 +1,6 @@
 import pytest
 import uuid
+from types import SimpleNamespace
 from datetime import datetime, timezone
 from src.infrastructure.mappers.message_mapper import MessageMapper
 
@@ -76,3 +77,27 @@ def test_to_db_maps_fields_correctly(mapper):
     assert db_entity.body == "Domain to DB"
     assert db_entity.created_at == now_utc
     assert db_entity.signature == "sig-domain"
+
+
+def test_to_domain_many_maps_plain_rows(mapper):
+    inbox_id = uuid.uuid4()
+    aware = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(
+            id=1, inbox_id=inbox_id, body="a", created_at=aware, signature=None
+        ),
+        SimpleNamespace(
+            id=2,
+            inbox_id=inbox_id,
+            body="b",
+            created_at=datetime(2024, 1, 1, 12, 0, 0),
+            signature="sig",
+        ),
+    ]
+
+    messages = mapper.to_domain_many(rows)
+
+    assert [m.id for m in messages] == [1, 2]
+    assert all(isinstance(m, Message) for m in messages)
+    assert messages[1].created_at == aware
+    assert messages[1].signature == "sig"
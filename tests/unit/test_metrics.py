@@ -0,0 +1,67 @@
+import asyncio
+
+from src.infrastructure.metrics import (
+    MetricsRegistry,
+    RequestTimings,
+    request_timings,
+    timed,
+)
+
+
+def test_histogram_buckets_are_cumulative_in_rendered_output():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        registry.observe_request("GET", "/x", 200, seconds, RequestTimings())
+
+    text = registry.render()
+
+    assert 'http_requests_total{method="GET",route="/x",status="200"} 3' in text
+    prefix = 'http_request_duration_seconds_bucket{method="GET",route="/x",'
+    assert prefix + 'le="0.1"} 1' in text
+    assert prefix + 'le="1"} 2' in text
+    assert prefix + 'le="+Inf"} 3' in text
+
+
+def test_service_phase_is_the_remainder_of_request_time():
+    registry = MetricsRegistry(buckets=(1.0,))
+    timings = RequestTimings(db=0.25, serialization=0.5)
+
+    registry.observe_request("GET", "/x", 200, 2.0, timings)
+
+    sums = {key[2]: histogram.sum for key, histogram in registry.phases.items()}
+    assert sums == {"db": 0.25, "serialization": 0.5, "service": 1.25}
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.observe_request("GET", 'a"b\\c', 200, 0.1, RequestTimings())
+
+    assert 'route="a\\"b\\\\c"' in registry.render()
+
+
+def test_timed_adds_to_the_current_request_only():
+    async def request():
+        timings = RequestTimings()
+        request_timings.set(timings)
+        with timed("serialization"):
+            await asyncio.sleep(0)
+        return timings
+
+    timings = asyncio.run(request())
+
+    assert timings.serialization > 0
+    assert request_timings.get() is None
+    with timed("serialization"):
+        pass
+
+
+def test_registered_collectors_are_rendered():
+    registry = MetricsRegistry()
+    registry.collectors["reaper"] = lambda: [
+        ("reaper_inboxes_deleted_total", "counter", 12)
+    ]
+
+    text = registry.render()
+
+    assert "# TYPE reaper_inboxes_deleted_total counter" in text
+    assert "reaper_inboxes_deleted_total 12\n" in text
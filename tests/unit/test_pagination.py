@@ -0,0 +1,80 @@
+import pytest
+import uuid
+from datetime import datetime, timezone
+
+from src.application.pagination import (
+    decode_inbox_cursor,
+    decode_message_cursor,
+    encode_inbox_cursor,
+    encode_message_cursor,
+    max_inbox_cursor_length,
+)
+from src.domain.exceptions import InvalidCursorError
+from src.domain.models import Inbox, Message
+from src.domain.repositories import InboxSort
+
+
+def test_message_cursor_round_trip():
+    created_at = datetime(2030, 5, 1, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    message = Message(inbox_id=uuid.uuid4(), body="hi", created_at=created_at, id=7)
+
+    cursor = encode_message_cursor(message)
+
+    assert "=" not in cursor
+    assert decode_message_cursor(cursor) == (created_at, 7)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "WzFd", "eyJhIjoxfQ"])
+def test_decode_message_cursor_rejects_garbage(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_message_cursor(cursor)
+
+
+def test_inbox_cursor_round_trip_per_sort():
+    expires_at = datetime(2031, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+    inbox = Inbox(
+        id=uuid.uuid4(),
+        topic="Cursor Topic",
+        owner_signature="sig",
+        expires_at=expires_at,
+        allow_anonymous=True,
+    )
+
+    by_topic = encode_inbox_cursor(inbox, InboxSort.TOPIC)
+    by_expiry = encode_inbox_cursor(inbox, InboxSort.EXPIRES_AT)
+
+    assert decode_inbox_cursor(by_topic, InboxSort.TOPIC) == ("Cursor Topic", inbox.id)
+    assert decode_inbox_cursor(by_expiry, InboxSort.EXPIRES_AT) == (
+        expires_at,
+        inbox.id,
+    )
+
+
+def test_inbox_cursor_rejects_mismatched_sort():
+    inbox = Inbox(
+        id=uuid.uuid4(),
+        topic="Cursor Topic",
+        owner_signature="sig",
+        expires_at=datetime(2031, 1, 1, tzinfo=timezone.utc),
+        allow_anonymous=True,
+    )
+    cursor = encode_inbox_cursor(inbox, InboxSort.TOPIC)
+
+    with pytest.raises(InvalidCursorError):
+        decode_inbox_cursor(cursor, InboxSort.EXPIRES_AT)
+
+
+@pytest.mark.parametrize("char", ["\U0001f600", "\x01", '"'])
+def test_inbox_cursor_never_exceeds_advertised_max_length(char):
+    inbox = Inbox(
+        id=uuid.uuid4(),
+        topic=char * 100,
+        owner_signature="sig",
+        expires_at=datetime(2031, 1, 1, tzinfo=timezone.utc),
+        allow_anonymous=True,
+    )
+
+    cursor = encode_inbox_cursor(inbox, InboxSort.TOPIC)
+
+    assert len(cursor) <= max_inbox_cursor_length(100)
+    assert decode_inbox_cursor(cursor, InboxSort.TOPIC)[0] == char * 100
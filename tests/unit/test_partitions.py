@@ -0,0 +1,46 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infrastructure.database.partitions import (
+    add_months,
+    create_partition_sql,
+    drop_expired_message_partitions,
+    ensure_message_partitions,
+    forget_messages_sql,
+    partition_name,
+)
+
+
+def test_add_months_rolls_over_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_ddl_covers_one_utc_month():
+    sql = create_partition_sql(date(2026, 12, 1))
+
+    assert partition_name(date(2026, 12, 1)) == "messages_p202612"
+    assert "messages_p202612 PARTITION OF messages" in sql
+    assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+
+
+def test_dropping_messages_adjusts_counters_and_bumps_versions():
+    sql = forget_messages_sql("messages_default", "WHERE created_at < :before")
+
+    assert "FROM messages_default WHERE created_at < :before GROUP BY inbox_id" in sql
+    assert "message_count = inboxes.message_count - gone.n" in sql
+    assert "version = inboxes.version + 1" in sql
+    # inboxes left without messages lose their last reply time
+    assert "WHEN inboxes.message_count = gone.n THEN NULL" in sql
+
+
+@pytest.mark.asyncio
+async def test_partition_maintenance_is_a_noop_on_sqlite():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+    assert await ensure_message_partitions(engine, months_ahead=3, now=now) == []
+    assert await drop_expired_message_partitions(engine, 6, now=now) == []
+    await engine.dispose()
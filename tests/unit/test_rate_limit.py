@@ -0,0 +1,76 @@
+import math
+
+import pytest
+
+from src.infrastructure.rate_limit import BucketCharge, InMemoryRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def charge(key="k", rate=2.0, burst=3, cost=1):
+    return [BucketCharge(key, rate, burst, cost)]
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_reports_wait_until_refill():
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter(clock=clock)
+
+    allowed = [await limiter.acquire(charge()) for _ in range(3)]
+    _, retry_after = await limiter.acquire(charge())
+    clock.now += 0.5
+    after_refill = await limiter.acquire(charge())
+
+    assert allowed == [None, None, None]
+    assert retry_after == pytest.approx(0.5)
+    assert after_refill is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_request_takes_no_tokens():
+    limiter = InMemoryRateLimiter(clock=FakeClock())
+
+    assert await limiter.acquire(charge(rate=1, burst=2)) is None
+    _, retry_after = await limiter.acquire(charge(rate=1, burst=2, cost=2))
+    assert retry_after == pytest.approx(1.0)
+    assert await limiter.acquire(charge(rate=1, burst=2)) is None
+
+
+@pytest.mark.asyncio
+async def test_a_short_bucket_leaves_the_others_untouched():
+    limiter = InMemoryRateLimiter(clock=FakeClock())
+    client = BucketCharge("client", rate=1, burst=2)
+    inbox = BucketCharge("inbox", rate=1, burst=1)
+
+    assert await limiter.acquire([client, inbox]) is None
+    rejected, _ = await limiter.acquire([client, inbox])
+
+    assert rejected == inbox
+    # the rejected request did not spend the client's second token
+    assert await limiter.acquire([client]) is None
+
+
+@pytest.mark.asyncio
+async def test_cost_above_burst_is_never_allowed_and_takes_nothing():
+    limiter = InMemoryRateLimiter(clock=FakeClock())
+
+    _, retry_after = await limiter.acquire(charge(burst=3, cost=4))
+
+    assert retry_after == math.inf
+    assert await limiter.acquire(charge(burst=3, cost=3)) is None
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent_and_memory_is_bounded():
+    limiter = InMemoryRateLimiter(shards=4, max_keys_per_shard=2)
+
+    for key in range(100):
+        assert await limiter.acquire(charge(key=key, burst=1)) is None
+
+    assert len(limiter) <= 8
@@ -0,0 +1,52 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from src.domain.models import Inbox, Message
+from src.interface.responses import inboxes_page_json, messages_page_json
+from src.interface.schemas import InboxesResponse, MessagesResponse
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _message(i: int) -> Message:
+    return Message(
+        inbox_id=uuid.uuid4(),
+        body=f"body {i} ünïcode",
+        created_at=NOW,
+        signature="bob!abc" if i % 2 else None,
+        id=i,
+    )
+
+
+def test_messages_page_matches_response_model():
+    messages = [_message(i) for i in range(3)]
+
+    fast = json.loads(messages_page_json(messages, "cursor"))
+    reference = json.loads(
+        MessagesResponse(messages=messages, next_cursor="cursor").model_dump_json()
+    )
+
+    assert fast == reference
+    assert "inbox_id" not in fast["messages"][0]
+
+
+def test_inboxes_page_matches_response_model():
+    inbox = Inbox(
+        id=uuid.uuid4(),
+        topic="Fast topic",
+        owner_signature="alice!secret",
+        expires_at=NOW + timedelta(days=1),
+        allow_anonymous=False,
+        message_count=2,
+        last_message_at=NOW,
+        messages=[_message(1)],
+    )
+
+    fast = json.loads(inboxes_page_json([inbox], None))
+    reference = json.loads(
+        InboxesResponse(inboxes=[inbox], next_cursor=None).model_dump_json()
+    )
+
+    assert fast == reference
+    assert "owner_signature" not in fast["inboxes"][0]
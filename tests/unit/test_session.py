@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.infrastructure.database import session as db_session
+
+
+def test_postgres_engine_uses_configured_pool(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 600)
+
+    engine = db_session.build_engine("postgresql+asyncpg://u:p@localhost/db")
+
+    pool = engine.pool
+    assert pool.size() == 7
+    assert pool._max_overflow == 3
+    assert pool._recycle == 600
+    assert pool._pre_ping is True
+
+
+def test_sqlite_engine_keeps_default_pool():
+    engine = db_session.build_engine("sqlite+aiosqlite:///:memory:")
+
+    assert engine.url.get_backend_name() == "sqlite"
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_builds_factory_once_and_warms_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        db_session,
+        "build_engine",
+        lambda: create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}", pool_size=3
+        ),
+    )
+    await db_session.dispose_engine()
+
+    factory = db_session.get_session_factory()
+    await db_session.warm_up_pool(3)
+
+    assert db_session.get_session_factory() is factory
+    assert db_session.engine.pool.checkedin() == 3
+
+    await db_session.dispose_engine()
+    assert db_session.engine is None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_is_clamped_to_pool_size(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(
+        db_session,
+        "build_engine",
+        lambda: create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'clamp.db'}",
+            pool_size=2,
+            max_overflow=0,
+            pool_timeout=1,
+        ),
+    )
+    monkeypatch.setattr(db_session.settings, "DB_POOL_SIZE", 2)
+    await db_session.dispose_engine()
+
+    with caplog.at_level("WARNING", logger=db_session.__name__):
+        await db_session.warm_up_pool(5)
+
+    assert db_session.engine.pool.checkedin() == 2
+    assert any("exceeds DB_POOL_SIZE" in r.getMessage() for r in caplog.records)
+
+    await db_session.dispose_engine()
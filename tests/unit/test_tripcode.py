@@ -0,0 +1,70 @@
+import hashlib
+import threading
+
+import pytest
+
+from src.application.tripcode import (
+    Pbkdf2TripcodeHasher,
+    ScryptTripcodeHasher,
+    Sha256TripcodeHasher,
+    TripcodeEngine,
+)
+
+SALT = "pepper"
+
+
+class RecordingHasher(Pbkdf2TripcodeHasher):
+    def __init__(self):
+        super().__init__(SALT, iterations=1_000)
+        self.calls = 0
+        self.threads = set()
+
+    def digest(self, username, secret):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        return super().digest(username, secret)
+
+
+@pytest.mark.asyncio
+async def test_sha256_engine_keeps_original_tripcode_format():
+    engine = TripcodeEngine(Sha256TripcodeHasher(SALT), cache_key=b"k")
+
+    tripcode = await engine.generate("alice", "secret123")
+
+    expected = hashlib.sha256(f"alicesecret123{SALT}".encode()).hexdigest()[:10]
+    assert tripcode == f"alice!{expected}"
+
+
+@pytest.mark.asyncio
+async def test_expensive_hasher_runs_off_loop_and_is_memoized():
+    hasher = RecordingHasher()
+    engine = TripcodeEngine(hasher, cache_key=b"k")
+
+    first = await engine.generate("alice", "secret123")
+    second = await engine.generate("alice", "secret123")
+    engine.shutdown()
+
+    assert first == second
+    assert hasher.calls == 1
+    assert all(name.startswith("tripcode") for name in hasher.threads)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_and_distinguishes_credentials():
+    hasher = RecordingHasher()
+    engine = TripcodeEngine(hasher, cache_key=b"k", cache_size=1)
+
+    alice = await engine.generate("alice", "secret123")
+    bob = await engine.generate("bob", "secret123")
+    await engine.generate("alice", "secret123")
+    engine.shutdown()
+
+    assert alice != bob
+    assert hasher.calls == 3
+
+
+def test_scrypt_hasher_is_deterministic_per_user():
+    hasher = ScryptTripcodeHasher(SALT, n=2**4)
+
+    assert hasher.digest("alice", "secret123") == hasher.digest("alice", "secret123")
+    assert hasher.digest("alice", "secret123") != hasher.digest("bob", "secret123")
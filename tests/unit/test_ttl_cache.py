@@ -0,0 +1,74 @@
+import asyncio
+import logging
+
+import pytest
+
+from src.infrastructure.cache import TTLCache, log_stats_periodically
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_value_and_counts_hits_and_misses():
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 5.0
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl_seconds=5)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_set_is_dropped_when_invalidated_since_read():
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    generation = cache.generation
+
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_stats_are_logged_periodically(caplog):
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    with caplog.at_level(logging.INFO, logger="src.infrastructure.cache"):
+        task = asyncio.create_task(log_stats_periodically("test", cache, 0.001))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+    assert "Cache test size=1 hits=1 misses=1" in caplog.text